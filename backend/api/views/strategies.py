@@ -230,9 +230,9 @@ class LLMConsensusView(APIView):
 
             # Generate consensus signal (async)
             try:
-                # Run the async function in an event loop
+                # Run the async function in a private event loop (not installed
+                # as the thread's current loop, so it is not left behind closed)
                 loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
                 try:
                     consensus = loop.run_until_complete(
                         orchestrator.generate_consensus_signal(
@@ -337,9 +337,8 @@ class LLMConsensusView(APIView):
                 timeout_seconds=30.0
             )
 
-            # Run health check async
+            # Run health check async in a private event loop
             loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
             try:
                 health_status = loop.run_until_complete(orchestrator.health_check())
             finally:
@@ -18,22 +18,33 @@ class FreqtradeClientError(Exception):
 class FreqtradeClient:
     """
     Client for communicating with Freqtrade REST API
+
+    Pass ``mock=True`` (or an ``api_url`` starting with ``mock://``) to skip
+    all HTTP traffic and serve the mock data directly.
     """
 
+    MOCK_URL_PREFIX = "mock://"
+
     def __init__(
         self,
         api_url: Optional[str] = None,
         username: Optional[str] = None,
         password: Optional[str] = None,
+        mock: bool = False,
     ):
-        self.api_url = (api_url or settings.FREQTRADE_API_URL).rstrip("/")
+        api_url = api_url or settings.FREQTRADE_API_URL
+        self.api_url = api_url.rstrip("/")
         self.username = username or settings.FREQTRADE_USERNAME
         self.password = password or settings.FREQTRADE_PASSWORD
+        self.mock = mock or api_url.startswith(self.MOCK_URL_PREFIX)
         self.session = requests.Session()
         self._authenticate()
 
     def _authenticate(self):
         """Authenticate with Freqtrade API"""
+        if self.mock:
+            return
+
         if not self.username or not self.password:
             logger.warning("No Freqtrade credentials provided")
             return
@@ -59,6 +70,10 @@ class FreqtradeClient:
     ) -> Dict[str, Any]:
         """Make HTTP request to Freqtrade API"""
         url = f"{self.api_url}/{endpoint.lstrip('/')}"
+        if self.mock:
+            # Fail fast so callers fall back to mock data without DNS/connect waits
+            raise FreqtradeClientError(f"Mock mode, no request sent: {method} {url}")
+
         try:
             response = self.session.request(method, url, timeout=30, **kwargs)
             response.raise_for_status()
@@ -113,6 +128,8 @@ class FreqtradeClient:
 
     def start_bot(self, bot_id: int) -> Dict[str, Any]:
         """Start a specific bot"""
+        if self.mock:
+            return self._get_mock_bot_action(bot_id, "started")
         try:
             result = self._make_request("POST", "/api/v1/start")
             return {"status": "success", "message": "Bot started"}
@@ -121,6 +138,8 @@ class FreqtradeClient:
 
     def stop_bot(self, bot_id: int) -> Dict[str, Any]:
         """Stop a specific bot"""
+        if self.mock:
+            return self._get_mock_bot_action(bot_id, "stopped")
         try:
             result = self._make_request("POST", "/api/v1/stop")
             return {"status": "success", "message": "Bot stopped"}
@@ -190,6 +209,10 @@ class FreqtradeClient:
             },
         ]
 
+    def _get_mock_bot_action(self, bot_id: int, action: str) -> Dict[str, Any]:
+        """Return mock start/stop result"""
+        return {"status": "success", "message": f"Bot {action} (mock)", "bot_id": bot_id}
+
     def _get_mock_performance(self) -> List[Dict[str, Any]]:
         """Return mock performance data"""
         return [
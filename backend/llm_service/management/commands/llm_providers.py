@@ -124,6 +124,7 @@ class Command(BaseCommand):
         self.stdout.write('  {PROVIDER}_TEMPERATURE  - Temperature (default: 0.7)')
         self.stdout.write('  {PROVIDER}_TIMEOUT      - Timeout in seconds (default: 30)')
         self.stdout.write('  {PROVIDER}_MAX_RETRIES  - Max retries (default: 3)')
+        self.stdout.write('  {PROVIDER}_MAX_CONCURRENCY - Max in-flight requests (default: 10)')
 
     def reinitialize_providers(self):
         """Reinitialize all providers from environment"""
@@ -8,6 +8,8 @@ import logging
 from typing import Dict, Any, Optional, List
 from django.conf import settings
 
+from .providers.base import VALID_DECISIONS
+
 try:
     from anthropic import Anthropic
 except ImportError:
@@ -187,7 +189,7 @@ Respond ONLY with valid JSON, no additional text."""
                     raise ValueError(f"Missing required field: {field}")
 
             # Validate decision value
-            if signal["decision"] not in ["BUY", "SELL", "HOLD"]:
+            if signal["decision"] not in VALID_DECISIONS:
                 raise ValueError(f"Invalid decision: {signal['decision']}")
 
             # Validate confidence range
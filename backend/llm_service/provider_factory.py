@@ -3,24 +3,48 @@ Provider Factory for Auto-Registration and Initialization
 Automatically registers LLM providers based on environment variables
 """
 import os
+import importlib
 import logging
-from typing import List, Dict, Any, Optional
+from collections.abc import Mapping
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple, Type
 
 from .providers import (
     BaseLLMProvider,
     ProviderConfig,
     ProviderRegistry,
     get_registry,
-    AnthropicProvider,
-    OpenAIProvider,
-    GeminiProvider,
-    GrokProvider,
 )
-from .providers.deepseek_provider import DeepSeekProvider
 
 logger = logging.getLogger(__name__)
 
 
+class LazyProviderClasses(Mapping):
+    """
+    Read-only mapping of provider names to provider classes
+
+    Each provider module (and therefore its vendor SDK) is imported the first
+    time its class is looked up, so unconfigured providers cost nothing.
+    """
+
+    def __init__(self, paths: Dict[str, Tuple[str, str]]):
+        self._paths = paths
+        self._classes: Dict[str, Type[BaseLLMProvider]] = {}
+
+    def __getitem__(self, name: str) -> Type[BaseLLMProvider]:
+        if name not in self._classes:
+            module_path, class_name = self._paths[name]
+            module = importlib.import_module(module_path, __package__)
+            self._classes[name] = getattr(module, class_name)
+        return self._classes[name]
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
 class ProviderFactory:
     """
     Factory for creating and registering LLM providers from environment variables
@@ -29,14 +53,14 @@ class ProviderFactory:
     Each provider requires an API key and can be enabled/disabled via env vars.
     """
 
-    # Mapping of provider names to their classes
-    PROVIDER_CLASSES = {
-        "anthropic": AnthropicProvider,
-        "openai": OpenAIProvider,
-        "gemini": GeminiProvider,
-        "grok": GrokProvider,
-        "deepseek": DeepSeekProvider,
-    }
+    # Mapping of provider names to their classes (imported on first lookup)
+    PROVIDER_CLASSES = LazyProviderClasses({
+        "anthropic": (".providers.anthropic_provider", "AnthropicProvider"),
+        "openai": (".providers.openai_provider", "OpenAIProvider"),
+        "gemini": (".providers.gemini_provider", "GeminiProvider"),
+        "grok": (".providers.grok_provider", "GrokProvider"),
+        "deepseek": (".providers.deepseek_provider", "DeepSeekProvider"),
+    })
 
     # Default model configurations for each provider
     DEFAULT_MODELS = {
@@ -84,6 +108,7 @@ class ProviderFactory:
         - {PROVIDER}_TEMPERATURE: Temperature (default: 0.7)
         - {PROVIDER}_TIMEOUT: Timeout in seconds (default: 30)
         - {PROVIDER}_MAX_RETRIES: Max retry attempts (default: 3)
+        - {PROVIDER}_MAX_CONCURRENCY: Max in-flight requests (default: 10)
 
         Args:
             provider_name: Name of the provider (e.g., "anthropic", "openai")
@@ -140,6 +165,12 @@ class ProviderFactory:
             logger.warning(f"Invalid max_retries for {provider_name}, using 3")
             max_retries = 3
 
+        try:
+            max_concurrency = int(cls.get_env_value(f"{provider_upper}_MAX_CONCURRENCY", "10"))
+        except (ValueError, TypeError):
+            logger.warning(f"Invalid max_concurrency for {provider_name}, using 10")
+            max_concurrency = 10
+
         # Get optional base URL (for custom endpoints like Grok)
         base_url = cls.get_env_value(f"{provider_upper}_BASE_URL")
 
@@ -151,6 +182,7 @@ class ProviderFactory:
             temperature=temperature,
             timeout=timeout,
             max_retries=max_retries,
+            max_concurrency=max_concurrency,
             weight=weight,
             enabled=enabled,
             base_url=base_url,
@@ -169,14 +201,15 @@ class ProviderFactory:
         Create provider instances from environment variables
 
         Scans for all supported providers and creates instances for those
-        with valid API keys.
+        with valid API keys. Provider modules without an API key are never
+        imported.
 
         Returns:
             List of instantiated provider instances
         """
         providers = []
 
-        for provider_name, provider_class in cls.PROVIDER_CLASSES.items():
+        for provider_name in cls.PROVIDER_CLASSES:
             try:
                 # Load configuration from environment
                 config = cls.load_provider_config(provider_name)
@@ -185,6 +218,7 @@ class ProviderFactory:
                     continue
 
                 # Create provider instance
+                provider_class = cls.PROVIDER_CLASSES[provider_name]
                 provider = provider_class(config)
                 providers.append(provider)
 
@@ -206,13 +240,17 @@ class ProviderFactory:
         """
         Register provider classes in the registry
 
-        This allows the registry to create provider instances on-demand.
+        This allows the registry to create provider instances on-demand. Each
+        class is registered as a loader, so its module is only imported when
+        registry.create_provider() first needs it.
 
         Args:
             registry: ProviderRegistry instance
         """
-        for provider_name, provider_class in cls.PROVIDER_CLASSES.items():
-            registry.register_provider_class(provider_name, provider_class)
+        for provider_name in cls.PROVIDER_CLASSES:
+            registry.register_provider_loader(
+                provider_name, partial(cls.PROVIDER_CLASSES.__getitem__, provider_name)
+            )
             logger.debug(f"Registered provider class: {provider_name}")
 
     @classmethod
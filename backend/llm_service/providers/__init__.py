@@ -1,4 +1,6 @@
 """LLM Provider Plugin System"""
+import importlib
+
 from .base import (
     BaseLLMProvider,
     ProviderConfig,
@@ -8,12 +10,17 @@ from .base import (
     ProviderTimeoutError,
     ProviderRateLimitError,
     ProviderAuthenticationError,
+    VALID_DECISIONS,
 )
-from .registry import ProviderRegistry, get_registry, reset_registry
-from .anthropic_provider import AnthropicProvider
-from .openai_provider import OpenAIProvider
-from .gemini_provider import GeminiProvider
-from .grok_provider import GrokProvider
+from .registry import ProviderRegistry, get_registry, reset_registry, set_registry
+
+# Provider classes pull in their vendor SDKs, so they are imported on first access
+_LAZY_PROVIDERS = {
+    "AnthropicProvider": ".anthropic_provider",
+    "OpenAIProvider": ".openai_provider",
+    "GeminiProvider": ".gemini_provider",
+    "GrokProvider": ".grok_provider",
+}
 
 __all__ = [
     "BaseLLMProvider",
@@ -24,11 +31,20 @@ __all__ = [
     "ProviderTimeoutError",
     "ProviderRateLimitError",
     "ProviderAuthenticationError",
+    "VALID_DECISIONS",
     "ProviderRegistry",
     "get_registry",
     "reset_registry",
+    "set_registry",
     "AnthropicProvider",
     "OpenAIProvider",
     "GeminiProvider",
     "GrokProvider",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_PROVIDERS:
+        module = importlib.import_module(_LAZY_PROVIDERS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -17,6 +17,12 @@ try:
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are unchanged
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from .base import (
     BaseLLMProvider,
     ProviderConfig,
@@ -26,6 +32,7 @@ from .base import (
     ProviderTimeoutError,
     ProviderAuthenticationError,
     ProviderRateLimitError,
+    VALID_DECISIONS,
 )
 
 logger = logging.getLogger(__name__)
@@ -374,7 +381,7 @@ class AnthropicProvider(BaseLLMProvider):
 
         # Parse JSON
         try:
-            signal = json.loads(json_str)
+            signal = _json_loads(json_str)
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing failed: {e}")
             logger.error(f"Attempted to parse: {json_str[:200]}")
@@ -402,7 +409,7 @@ class AnthropicProvider(BaseLLMProvider):
 
         # Validate decision value
         decision = str(normalized_signal["decision"]).upper().strip()
-        if decision not in ["BUY", "SELL", "HOLD"]:
+        if decision not in VALID_DECISIONS:
             raise ValueError(
                 f"Invalid decision value: '{decision}'. "
                 f"Must be one of: BUY, SELL, HOLD"
@@ -482,15 +489,9 @@ class AnthropicProvider(BaseLLMProvider):
         """
         strategies = [
             # Strategy 1: Extract from ```json...``` blocks
-            lambda text: (
-                text.split("```json")[1].split("```")[0].strip()
-                if "```json" in text else None
-            ),
+            lambda text: self._find_fenced_block(text, "```json"),
             # Strategy 2: Extract from ```...``` blocks
-            lambda text: (
-                text.split("```")[1].split("```")[0].strip()
-                if text.count("```") >= 2 else None
-            ),
+            lambda text: self._find_fenced_block(text, "```"),
             # Strategy 3: Find JSON object using regex
             lambda text: self._find_json_in_text(text),
             # Strategy 4: Try to use the text as-is
@@ -502,7 +503,7 @@ class AnthropicProvider(BaseLLMProvider):
                 json_str = strategy(response_text)
                 if json_str:
                     # Validate it's JSON by attempting to parse
-                    json.loads(json_str)
+                    _json_loads(json_str)
                     return json_str
             except (json.JSONDecodeError, IndexError, AttributeError):
                 continue
@@ -512,6 +513,29 @@ class AnthropicProvider(BaseLLMProvider):
             f"Response preview: {response_text[:200]}"
         )
 
+    @staticmethod
+    def _find_fenced_block(text: str, fence: str) -> Optional[str]:
+        """
+        Return the contents of the first code block opened by ``fence``
+
+        Scans with str.find rather than splitting the whole response, so only
+        the first block is ever copied.
+
+        Args:
+            text: Text to search
+            fence: Opening fence, e.g. ```json
+
+        Returns:
+            Stripped block contents (running to the end of the text if the
+            block is never closed), or None if ``fence`` does not occur
+        """
+        start = text.find(fence)
+        if start == -1:
+            return None
+        start += len(fence)
+        end = text.find("```", start)
+        return text[start:end if end != -1 else len(text)].strip()
+
     def _find_json_in_text(self, text: str) -> Optional[str]:
         """
         Find JSON object in text using regex pattern matching
@@ -566,15 +590,16 @@ class AnthropicProvider(BaseLLMProvider):
             ProviderError: For other API errors
         """
         try:
-            message = await asyncio.wait_for(
-                self.client.messages.create(
-                    model=self.config.model,
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                    messages=[{"role": "user", "content": prompt}],
-                ),
-                timeout=self.config.timeout
-            )
+            async with self._request_slot():
+                message = await asyncio.wait_for(
+                    self.client.messages.create(
+                        model=self.config.model,
+                        max_tokens=self.config.max_tokens,
+                        temperature=self.config.temperature,
+                        messages=[{"role": "user", "content": prompt}],
+                    ),
+                    timeout=self.config.timeout
+                )
             return message
 
         except asyncio.TimeoutError as e:
@@ -5,9 +5,11 @@ Defines abstract interfaces and data structures for LLM providers
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, FrozenSet, Optional, List
 from datetime import datetime
+import asyncio
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,10 @@ class ProviderStatus(Enum):
     CIRCUIT_OPEN = "circuit_open"
 
 
+# Trading decisions a provider may return
+VALID_DECISIONS: FrozenSet[str] = frozenset({"BUY", "SELL", "HOLD"})
+
+
 @dataclass
 class ProviderConfig:
     """Configuration for an LLM provider"""
@@ -34,6 +40,7 @@ class ProviderConfig:
     enabled: bool = True
     base_url: Optional[str] = None  # For custom endpoints
     extra_params: Dict[str, Any] = field(default_factory=dict)
+    max_concurrency: int = 10  # Max in-flight API requests per event loop
 
     def __post_init__(self):
         """Validate configuration"""
@@ -43,6 +50,8 @@ class ProviderConfig:
             raise ValueError("max_tokens must be positive")
         if self.timeout < 1:
             raise ValueError("timeout must be positive")
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
 
 
 @dataclass
@@ -105,6 +114,7 @@ class BaseLLMProvider(ABC):
         self._total_latency = 0.0
         self._last_error: Optional[Exception] = None
         self._last_request_time: Optional[datetime] = None
+        self._request_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
         logger.info(f"Initialized {self.config.name} provider with model {self.config.model}")
 
@@ -253,6 +263,24 @@ class BaseLLMProvider(ABC):
                 formatted.append(f"{key}: {value}")
         return "\n".join(formatted)
 
+    def _request_slot(self) -> asyncio.Semaphore:
+        """
+        Semaphore bounding in-flight API requests to config.max_concurrency
+
+        asyncio primitives are bound to a single event loop and views run each
+        request on a fresh loop, so each running loop gets its own semaphore.
+        They are keyed weakly so a closed loop's semaphore goes with it.
+
+        Returns:
+            Semaphore to hold (``async with``) around each API call
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._request_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.config.max_concurrency)
+            self._request_semaphores[loop] = semaphore
+        return semaphore
+
     def build_prompt(
         self,
         market_data: Dict[str, Any],
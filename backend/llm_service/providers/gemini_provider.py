@@ -21,6 +21,7 @@ from .base import (
     ProviderError,
     ProviderTimeoutError,
     ProviderAuthenticationError,
+    VALID_DECISIONS,
 )
 
 logger = logging.getLogger(__name__)
@@ -118,11 +119,12 @@ class GeminiProvider(BaseLLMProvider):
 
             # Call Gemini API (run in executor since it's sync)
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                self.model.generate_content,
-                prompt
-            )
+            async with self._request_slot():
+                response = await loop.run_in_executor(
+                    None,
+                    self.model.generate_content,
+                    prompt
+                )
 
             # Extract response text
             response_text = response.text
@@ -266,7 +268,7 @@ class GeminiProvider(BaseLLMProvider):
                 raise ValueError(f"Missing required field: {field}")
 
         # Validate decision value
-        if signal["decision"] not in ["BUY", "SELL", "HOLD"]:
+        if signal["decision"] not in VALID_DECISIONS:
             raise ValueError(f"Invalid decision: {signal['decision']}")
 
         # Validate confidence range
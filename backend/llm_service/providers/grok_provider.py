@@ -21,6 +21,7 @@ from .base import (
     ProviderError,
     ProviderTimeoutError,
     ProviderAuthenticationError,
+    VALID_DECISIONS,
 )
 
 logger = logging.getLogger(__name__)
@@ -120,12 +121,13 @@ class GrokProvider(BaseLLMProvider):
             prompt = self.build_prompt(market_data, pair, timeframe, current_price)
 
             # Call Grok API (OpenAI-compatible)
-            completion = await self.client.chat.completions.create(
-                model=self.config.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-            )
+            async with self._request_slot():
+                completion = await self.client.chat.completions.create(
+                    model=self.config.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature,
+                )
 
             # Extract response text
             response_text = completion.choices[0].message.content
@@ -266,7 +268,7 @@ class GrokProvider(BaseLLMProvider):
                 raise ValueError(f"Missing required field: {field}")
 
         # Validate decision value
-        if signal["decision"] not in ["BUY", "SELL", "HOLD"]:
+        if signal["decision"] not in VALID_DECISIONS:
             raise ValueError(f"Invalid decision: {signal['decision']}")
 
         # Validate confidence range
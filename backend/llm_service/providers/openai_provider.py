@@ -7,7 +7,7 @@ import json
 import logging
 import time
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 try:
     from openai import AsyncOpenAI, OpenAI
@@ -24,6 +24,7 @@ from .base import (
     ProviderTimeoutError,
     ProviderAuthenticationError,
     ProviderRateLimitError,
+    VALID_DECISIONS,
 )
 
 logger = logging.getLogger(__name__)
@@ -63,6 +64,11 @@ class OpenAIProvider(BaseLLMProvider):
     DEFAULT_BACKOFF_MULTIPLIER = 2.0
     DEFAULT_MAX_RETRY_DELAY = 30.0  # seconds
 
+    # Batch API configuration
+    BATCH_COST_MULTIPLIER = 0.5  # Batch requests are billed at half the synchronous price
+    BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+    DEFAULT_BATCH_POLL_INTERVAL = 30.0  # seconds
+
     def __init__(self, config: ProviderConfig):
         """
         Initialize OpenAI provider with async client.
@@ -97,6 +103,11 @@ class OpenAIProvider(BaseLLMProvider):
         self.backoff_multiplier = self.DEFAULT_BACKOFF_MULTIPLIER
         self.max_retry_delay = self.DEFAULT_MAX_RETRY_DELAY
 
+        # Resolve per-token rates once; unknown models fall back to gpt-4-turbo pricing
+        pricing = self.PRICING.get(config.model, self.PRICING["gpt-4-turbo"])
+        self._input_cost_per_token = pricing["input"] / 1_000_000
+        self._output_cost_per_token = pricing["output"] / 1_000_000
+
         try:
             logger.debug(f"Initializing AsyncOpenAI client for {config.name}")
             self.client = AsyncOpenAI(
@@ -169,15 +180,13 @@ class OpenAIProvider(BaseLLMProvider):
                 logger.debug(f"Prompt built for {pair} ({len(prompt)} chars)")
 
                 # Call OpenAI API with timeout handling
-                completion = await asyncio.wait_for(
-                    self.client.chat.completions.create(
+                async with self._request_slot(), asyncio.timeout(self.config.timeout):
+                    completion = await self.client.chat.completions.create(
                         model=self.config.model,
                         messages=[{"role": "user", "content": prompt}],
                         max_tokens=self.config.max_tokens,
                         temperature=self.config.temperature,
-                    ),
-                    timeout=self.config.timeout,
-                )
+                    )
 
                 # Extract response text
                 response_text = completion.choices[0].message.content
@@ -322,6 +331,172 @@ class OpenAIProvider(BaseLLMProvider):
                 retry_count += 1
                 await self._wait_with_backoff(retry_count)
 
+    async def generate_signal_batch(
+        self,
+        items: List[Dict[str, Any]],
+        poll_interval: float = DEFAULT_BATCH_POLL_INTERVAL,
+        max_wait: Optional[float] = None,
+    ) -> List[ProviderResponse]:
+        """
+        Generate trading signals for many pairs through the OpenAI Batch API.
+
+        Uploads one chat completion request per item as a JSONL file, polls the
+        batch until it finishes and parses every result. Batch requests cost half
+        as much as generate_signal but may take up to 24h, so this suits offline
+        work such as backtests rather than live trading.
+
+        Args:
+            items: generate_signal keyword arguments for each signal
+                (market_data, pair, timeframe and optionally current_price)
+            poll_interval: Seconds to wait between batch status checks
+            max_wait: Seconds to keep polling before giving up (None waits for
+                the batch's own completion window). The batch is left running.
+
+        Returns:
+            ProviderResponse objects in the same order as ``items``
+
+        Raises:
+            ProviderTimeoutError: If the batch is still running after ``max_wait``
+            ProviderError: If the batch does not complete or any item fails
+
+        Example:
+            >>> responses = await provider.generate_signal_batch([
+            ...     {"market_data": {"rsi": 45.2}, "pair": "BTC/USDT", "timeframe": "1h"},
+            ...     {"market_data": {"rsi": 71.8}, "pair": "ETH/USDT", "timeframe": "1h"},
+            ... ])
+        """
+        if not items:
+            return []
+
+        logger.debug(f"Generating {len(items)} signals via OpenAI Batch API")
+        start_time = time.time()
+
+        # One chat completion request per line; custom_id maps results back to items
+        lines = []
+        for index, item in enumerate(items):
+            prompt = self.build_prompt(
+                item["market_data"], item["pair"], item["timeframe"], item.get("current_price")
+            )
+            lines.append(json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.config.model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": self.config.max_tokens,
+                    "temperature": self.config.temperature,
+                },
+            }))
+
+        try:
+            batch_file = await self.client.files.create(
+                file=("signals.jsonl", "\n".join(lines).encode()),
+                purpose="batch",
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            logger.info(f"Submitted OpenAI batch {batch.id} with {len(items)} requests")
+
+            try:
+                async with asyncio.timeout(max_wait):
+                    while batch.status not in self.BATCH_TERMINAL_STATUSES:
+                        await asyncio.sleep(poll_interval)
+                        batch = await self.client.batches.retrieve(batch.id)
+            except TimeoutError:
+                raise ProviderTimeoutError(
+                    self.config.name,
+                    f"OpenAI batch {batch.id} still {batch.status} after {max_wait}s"
+                )
+
+            if batch.status != "completed" or not batch.output_file_id:
+                raise ProviderError(
+                    self.config.name,
+                    f"OpenAI batch {batch.id} ended with status {batch.status}"
+                )
+
+            output = await self.client.files.content(batch.output_file_id)
+            results = {}
+            for line in output.text.splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    results[int(record["custom_id"])] = record
+
+            latency_ms = (time.time() - start_time) * 1000
+            responses = []
+            for index, item in enumerate(items):
+                record = results.get(index) or {}
+                result = record.get("response") or {}
+                if result.get("status_code") != 200:
+                    raise ProviderError(
+                        self.config.name,
+                        f"OpenAI batch {batch.id} request for {item['pair']} failed: "
+                        f"{record.get('error') or 'no result'}"
+                    )
+
+                completion = result["body"]
+                response_text = completion["choices"][0]["message"]["content"]
+                signal_data = self._parse_response(response_text)
+                usage = completion["usage"]
+                cost_usd = self.estimate_cost(
+                    usage["prompt_tokens"], usage["completion_tokens"]
+                ) * self.BATCH_COST_MULTIPLIER
+
+                responses.append(ProviderResponse(
+                    provider_name=self.config.name,
+                    model=self.config.model,
+                    decision=signal_data["decision"],
+                    confidence=signal_data["confidence"],
+                    reasoning=signal_data["reasoning"],
+                    risk_level=signal_data.get("risk_level"),
+                    suggested_stop_loss=signal_data.get("suggested_stop_loss"),
+                    suggested_take_profit=signal_data.get("suggested_take_profit"),
+                    raw_response=response_text,
+                    latency_ms=latency_ms,
+                    tokens_used=usage["total_tokens"],
+                    cost_usd=cost_usd,
+                    metadata={
+                        "prompt_tokens": usage["prompt_tokens"],
+                        "completion_tokens": usage["completion_tokens"],
+                        "finish_reason": completion["choices"][0].get("finish_reason"),
+                        "batch_id": batch.id,
+                    }
+                ))
+
+        except ProviderError as e:
+            self.update_metrics((time.time() - start_time) * 1000, e)
+            raise
+
+        except (ValueError, KeyError) as e:
+            error = ProviderError(
+                self.config.name,
+                f"Invalid OpenAI batch response format: {e}",
+                e
+            )
+            self.update_metrics((time.time() - start_time) * 1000, error)
+            raise error
+
+        except Exception as e:
+            error = ProviderError(
+                self.config.name,
+                f"OpenAI batch request failed: {e}",
+                e
+            )
+            self.update_metrics((time.time() - start_time) * 1000, error)
+            raise error
+
+        # The whole batch counts as a single request in provider metrics
+        self.update_metrics(latency_ms)
+        logger.info(
+            f"OpenAI batch {batch.id} produced {len(responses)} signals "
+            f"(latency: {latency_ms:.0f}ms, cost: ${sum(r.cost_usd for r in responses):.4f})"
+        )
+
+        return responses
+
     async def _wait_with_backoff(self, retry_count: int) -> None:
         """
         Wait with exponential backoff before retrying.
@@ -357,14 +532,12 @@ class OpenAIProvider(BaseLLMProvider):
             logger.debug(f"Starting health check for {self.config.name}")
 
             # Minimal API call to check connectivity
-            await asyncio.wait_for(
-                self.client.chat.completions.create(
+            async with asyncio.timeout(self.config.timeout):
+                await self.client.chat.completions.create(
                     model=self.config.model,
                     messages=[{"role": "user", "content": "ping"}],
                     max_tokens=10,
-                ),
-                timeout=self.config.timeout,
-            )
+                )
 
             logger.info(f"{self.config.name} health check: HEALTHY")
             return True
@@ -397,17 +570,11 @@ class OpenAIProvider(BaseLLMProvider):
         Returns:
             Estimated cost in USD
         """
-        # Get model-specific pricing or use gpt-4-turbo as default
-        pricing = self.PRICING.get(
-            self.config.model,
-            self.PRICING["gpt-4-turbo"]
+        return (
+            prompt_tokens * self._input_cost_per_token
+            + completion_tokens * self._output_cost_per_token
         )
 
-        input_cost = (prompt_tokens / 1_000_000) * pricing["input"]
-        output_cost = (completion_tokens / 1_000_000) * pricing["output"]
-
-        return input_cost + output_cost
-
     def _parse_response(self, response_text: str) -> Dict[str, Any]:
         """
         Parse GPT's JSON response with comprehensive edge case handling.
@@ -490,7 +657,7 @@ class OpenAIProvider(BaseLLMProvider):
 
         # Validate and normalize decision
         decision = str(signal.get("decision", "")).upper().strip()
-        if decision not in ["BUY", "SELL", "HOLD"]:
+        if decision not in VALID_DECISIONS:
             raise ValueError(
                 f"Invalid decision '{decision}'. Must be one of: BUY, SELL, HOLD"
             )
@@ -2,7 +2,7 @@
 Provider Registry for Multi-LLM System
 Manages registration, discovery, and lifecycle of LLM providers
 """
-from typing import Dict, List, Optional, Type
+from typing import Callable, Dict, List, Optional, Type
 import logging
 from .base import BaseLLMProvider, ProviderConfig, ProviderStatus
 
@@ -22,6 +22,7 @@ class ProviderRegistry:
         """Initialize the provider registry"""
         self._providers: Dict[str, BaseLLMProvider] = {}
         self._provider_classes: Dict[str, Type[BaseLLMProvider]] = {}
+        self._provider_loaders: Dict[str, Callable[[], Type[BaseLLMProvider]]] = {}
         logger.info("Provider registry initialized")
 
     def register_provider_class(
@@ -45,6 +46,27 @@ class ProviderRegistry:
         self._provider_classes[name] = provider_class
         logger.info(f"Registered provider class: {name}")
 
+    def register_provider_loader(
+        self,
+        name: str,
+        loader: Callable[[], Type[BaseLLMProvider]]
+    ) -> None:
+        """
+        Register a callable returning a provider class, for later instantiation
+
+        The loader is only called by create_provider, so a provider module (and
+        its vendor SDK) is not imported until an instance is actually needed.
+
+        Args:
+            name: Provider identifier (e.g., "anthropic", "openai")
+            loader: Zero-argument callable returning the provider class
+        """
+        if name in self._provider_loaders:
+            logger.warning(f"Provider loader {name} already registered, overwriting")
+
+        self._provider_loaders[name] = loader
+        logger.info(f"Registered provider loader: {name}")
+
     def register_provider(
         self,
         name: str,
@@ -85,7 +107,9 @@ class ProviderRegistry:
             ValueError: If provider class not registered
         """
         if name not in self._provider_classes:
-            raise ValueError(f"Provider class {name} not registered")
+            if name not in self._provider_loaders:
+                raise ValueError(f"Provider class {name} not registered")
+            self._provider_classes[name] = self._provider_loaders[name]()
 
         provider_class = self._provider_classes[name]
         provider = provider_class(config)
@@ -219,13 +243,16 @@ class ProviderRegistry:
             "available_providers": available,
             "providers_by_status": by_status,
             "provider_names": list(self._providers.keys()),
-            "registered_classes": list(self._provider_classes.keys()),
+            "registered_classes": list({**self._provider_loaders, **self._provider_classes}),
         }
 
     async def health_check_all(self) -> Dict[str, bool]:
         """
         Perform health check on all providers
 
+        Updates each provider's status in place: unhealthy providers become
+        DEGRADED, failing ones UNAVAILABLE and recovered ones ACTIVE again.
+
         Returns:
             Dictionary mapping provider name to health status
         """
@@ -308,3 +335,14 @@ def reset_registry() -> None:
     if _global_registry:
         _global_registry.clear()
     _global_registry = None
+
+
+def set_registry(registry: Optional[ProviderRegistry]) -> None:
+    """
+    Install a registry as the global instance without clearing the old one (mainly for testing)
+
+    Args:
+        registry: Registry to install, or None so the next get_registry() builds a fresh one
+    """
+    global _global_registry
+    _global_registry = registry
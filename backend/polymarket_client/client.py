@@ -27,6 +27,10 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Backoff and rate-limit waits go through this alias so tests can stub them
+# without replacing asyncio.sleep for the whole event loop
+_sleep = asyncio.sleep
+
 
 class PolymarketClient:
     """
@@ -138,7 +142,7 @@ class PolymarketClient:
                         f"Rate limit reached ({self.rate_limit} req/min). "
                         f"Waiting {wait_time:.2f}s..."
                     )
-                    await asyncio.sleep(wait_time)
+                    await _sleep(wait_time)
                     # Remove old requests after waiting
                     current_time = time.time()
                     self._request_times = [
@@ -239,14 +243,14 @@ class PolymarketClient:
             if retry_count < self.max_retries:
                 wait_time = 2 ** retry_count
                 logger.warning(f"Request timeout. Retrying in {wait_time}s... ({e})")
-                await asyncio.sleep(wait_time)
+                await _sleep(wait_time)
                 return await self._make_request(method, endpoint, params, json_data, retry_count + 1)
             raise PolymarketTimeoutError(f"Request timeout after {self.max_retries} retries: {e}")
 
         except PolymarketRateLimitError as e:
             if retry_count < self.max_retries and e.retry_after:
                 logger.warning(f"Rate limited. Retrying in {e.retry_after}s...")
-                await asyncio.sleep(e.retry_after)
+                await _sleep(e.retry_after)
                 return await self._make_request(method, endpoint, params, json_data, retry_count + 1)
             raise
 
@@ -258,7 +262,7 @@ class PolymarketClient:
             if retry_count < self.max_retries and 500 <= e.status_code < 600:
                 wait_time = 2 ** retry_count
                 logger.warning(f"Server error. Retrying in {wait_time}s...")
-                await asyncio.sleep(wait_time)
+                await _sleep(wait_time)
                 return await self._make_request(method, endpoint, params, json_data, retry_count + 1)
             raise
 
@@ -6,9 +6,10 @@ that simulates API responses without making actual HTTP requests.
 """
 
 import asyncio
+import copy
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import random
 import uuid
 
@@ -49,6 +50,7 @@ class MockPolymarketClient:
         initial_balance: float = 10000.0,
         simulate_errors: bool = False,
         error_probability: float = 0.0,
+        force_error: bool = False,
     ):
         """
         Initialize mock Polymarket client.
@@ -59,16 +61,20 @@ class MockPolymarketClient:
             initial_balance: Initial account balance
             simulate_errors: Whether to randomly simulate errors
             error_probability: Probability of simulating an error (0.0-1.0)
+            force_error: Fail every request with a simulated API error (no randomness)
         """
         self.api_key = api_key or "mock_api_key"
         self.api_secret = api_secret or "mock_api_secret"
         self.simulate_errors = simulate_errors
         self.error_probability = error_probability
+        self.force_error = force_error
+        self._initial_balance = initial_balance
 
         # In-memory state
         self._markets: Dict[str, Market] = {}
+        self._markets_cache: Optional[List[Market]] = None  # list view of _markets
         self._orders: Dict[str, Order] = {}
-        self._positions: Dict[str, Position] = {}
+        self._positions: Dict[Tuple[str, str], Position] = {}  # keyed by (market_id, outcome)
         self._balance = {
             "total": initial_balance,
             "available": initial_balance,
@@ -82,10 +88,18 @@ class MockPolymarketClient:
 
     async def __aenter__(self):
         """Async context manager entry."""
-        return self
+        return await self._open()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        await self._close()
+
+    async def _open(self):
+        """Set up the client (what ``async with`` does on entry)."""
+        return self
+
+    async def _close(self):
+        """Tear down the client (what ``async with`` does on exit)."""
         await self.close()
 
     async def close(self):
@@ -93,7 +107,9 @@ class MockPolymarketClient:
         pass
 
     def _maybe_simulate_error(self):
-        """Randomly simulate an error based on error_probability."""
+        """Simulate an error if forced, or randomly based on error_probability."""
+        if self.force_error:
+            raise PolymarketAPIError("Simulated API error")
         if self.simulate_errors and random.random() < self.error_probability:
             error_types = [
                 PolymarketAPIError("Simulated API error"),
@@ -175,7 +191,9 @@ class MockPolymarketClient:
         self._maybe_simulate_error()
         await asyncio.sleep(0.01)  # Simulate network delay
 
-        markets = list(self._markets.values())
+        if self._markets_cache is None:
+            self._markets_cache = list(self._markets.values())
+        markets = self._markets_cache
 
         # Filter by status if provided
         if status:
@@ -365,7 +383,7 @@ class MockPolymarketClient:
         price: float,
     ):
         """Update position after trade execution."""
-        position_key = f"{market_id}_{outcome}"
+        position_key = (market_id, outcome)
 
         if position_key not in self._positions:
             # Create new position
@@ -413,13 +431,7 @@ class MockPolymarketClient:
 
         # Update current prices
         for position in positions:
-            market = self._markets.get(position.market_id)
-            if market:
-                position.current_price = (
-                    market.yes_price if position.outcome == "YES" else market.no_price
-                )
-                position.market_value = position.size * position.current_price
-                position.unrealized_pnl = position.market_value - position.cost_basis
+            self._refresh_position(position)
 
         # Filter out zero positions
         positions = [p for p in positions if p.size > 0]
@@ -428,11 +440,25 @@ class MockPolymarketClient:
 
     async def get_position(self, market_id: str, outcome: str) -> Optional[Position]:
         """Fetch specific position."""
-        positions = await self.get_positions(market_id=market_id)
-        for position in positions:
-            if position.market_id == market_id and position.outcome == outcome:
-                return position
-        return None
+        self._maybe_simulate_error()
+        await asyncio.sleep(0.01)
+
+        position = self._positions.get((market_id, outcome))
+        if position is None:
+            return None
+
+        self._refresh_position(position)
+        return position if position.size > 0 else None
+
+    def _refresh_position(self, position: Position):
+        """Mark a position to the current market price."""
+        market = self._markets.get(position.market_id)
+        if market:
+            position.current_price = (
+                market.yes_price if position.outcome == "YES" else market.no_price
+            )
+            position.market_value = position.size * position.current_price
+            position.unrealized_pnl = position.market_value - position.cost_basis
 
     async def get_balance(self) -> Dict[str, float]:
         """Fetch account balance."""
@@ -444,18 +470,40 @@ class MockPolymarketClient:
     # Test Utilities
     # ============================================================================
 
-    def reset(self):
-        """Reset mock client state (for testing)."""
+    def reset(self, preserve_markets: bool = False):
+        """
+        Reset mock client state (for testing).
+
+        Args:
+            preserve_markets: Keep the current markets instead of regenerating
+                the sample set; only orders, positions and balance are cleared
+        """
         self._orders.clear()
         self._positions.clear()
         self._balance = {
-            "total": 10000.0,
-            "available": 10000.0,
+            "total": self._initial_balance,
+            "available": self._initial_balance,
             "reserved": 0.0,
         }
-        self._generate_sample_markets()
+        if not preserve_markets:
+            self._markets_cache = None
+            self._generate_sample_markets()
         logger.info("Reset MockPolymarketClient state")
 
+    def snapshot_markets(self) -> List[Market]:
+        """Copy the current markets, to hand back to restore_markets (for testing)."""
+        return [copy.copy(market) for market in self._markets.values()]
+
+    def restore_markets(self, snapshot: List[Market]):
+        """
+        Replace all markets with those in ``snapshot`` (for testing).
+
+        Prices are the only market fields the client mutates, so shallow copies
+        keep the snapshot reusable.
+        """
+        self._markets = {market.id: copy.copy(market) for market in snapshot}
+        self._markets_cache = None
+
     def set_market_price(self, market_id: str, yes_price: float):
         """Set market price (for testing)."""
         if market_id in self._markets:
@@ -465,3 +513,4 @@ class MockPolymarketClient:
     def add_market(self, market: Market):
         """Add a custom market (for testing)."""
         self._markets[market.id] = market
+        self._markets_cache = None
@@ -0,0 +1,28 @@
+"""
+Shared pytest hooks and fixtures for the backend test suite
+"""
+import asyncio
+
+import pytest
+from pytest_asyncio import is_async_test
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on one session-scoped event loop"""
+    session_loop = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Use uvloop's event loop when it is installed"""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
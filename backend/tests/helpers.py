@@ -0,0 +1,77 @@
+"""
+Test doubles shared across the backend test suite
+"""
+import asyncio
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Optional
+
+from llm_service.providers.base import ProviderConfig, ProviderResponse, ProviderStatus
+
+
+@lru_cache(maxsize=None)
+def _provider_response(name: str, decision: str, confidence: float) -> ProviderResponse:
+    """Canned response, built once per (provider, decision, confidence) and shared"""
+    return ProviderResponse(
+        provider_name=name,
+        model=f"model-{name}",
+        decision=decision,
+        confidence=confidence,
+        reasoning=f"Reasoning from {name}",
+        risk_level="medium",
+        latency_ms=100.0,
+        tokens_used=500,
+        cost_usd=0.001,
+    )
+
+
+@dataclass(slots=True)
+class FakeProvider:
+    """Duck-typed provider with a plain async generate_signal (no Mock overhead)"""
+    name: str
+    decision: str = "BUY"
+    confidence: float = 0.85
+    fail_with: Optional[Exception] = None
+    hang: bool = False
+    status: ProviderStatus = ProviderStatus.ACTIVE
+    config: ProviderConfig = field(init=False)
+
+    def __post_init__(self):
+        self.config = ProviderConfig(
+            name=self.name,
+            model=f"model-{self.name}",
+            api_key="test-key",
+            weight=1.0,
+            enabled=True,
+        )
+
+    def is_available(self) -> bool:
+        return True
+
+    async def generate_signal(self, market_data, pair, timeframe, current_price):
+        if self.hang:
+            # Never answers; cancellation-clean unlike a long sleep
+            await asyncio.Event().wait()
+        if self.fail_with is not None:
+            raise self.fail_with
+        # Shared instance: the orchestrator and aggregator only read responses
+        # and no test mutates one, so handing out the cached object is safe
+        return _provider_response(self.name, self.decision, self.confidence)
+
+
+def make_providers(*, names, decision="BUY", confidence=0.8, fail_with=None):
+    """Build one FakeProvider per name with identical behaviour"""
+    return [
+        FakeProvider(name=name, decision=decision, confidence=confidence, fail_with=fail_with)
+        for name in names
+    ]
+
+
+def registry_with(providers):
+    """Stand-in registry exposing exactly the given providers"""
+    by_name = {p.config.name: p for p in providers}
+    return SimpleNamespace(
+        get_available_providers=lambda: providers,
+        get_provider=by_name.get,
+    )
@@ -7,7 +7,7 @@ import pytest
 from unittest.mock import patch, AsyncMock
 
 from llm_service.provider_factory import ProviderFactory
-from llm_service.providers import get_registry, reset_registry, ProviderResponse
+from llm_service.providers import get_registry, reset_registry, ProviderResponse, ProviderStatus
 from llm_service.multi_provider_orchestrator import MultiProviderOrchestrator
 
 
@@ -19,6 +19,33 @@ def clean_registry():
     reset_registry()
 
 
+_MOCK_BUY = ProviderResponse(
+    provider_name="test",
+    model="test-model",
+    decision="BUY",
+    confidence=0.85,
+    reasoning="Test reasoning",
+    risk_level="medium",
+    latency_ms=100.0,
+    tokens_used=100,
+    cost_usd=0.01
+)
+
+
+def _const_coro(response):
+    """Build a generate_signal stand-in that always returns response"""
+    async def generate_signal(*args, **kwargs):
+        return response
+    return generate_signal
+
+
+def attach_signal(providers, response):
+    """Make every provider in providers return response from generate_signal"""
+    generate_signal = _const_coro(response)
+    for provider in providers:
+        object.__setattr__(provider, "generate_signal", generate_signal)
+
+
 @pytest.fixture
 def full_env_config():
     """Complete environment configuration for all providers"""
@@ -42,7 +69,6 @@ def full_env_config():
     }
 
 
-@pytest.mark.asyncio
 class TestProviderFactoryIntegration:
     """Integration tests for Provider Factory with Orchestrator"""
 
@@ -70,20 +96,7 @@ class TestProviderFactoryIntegration:
             assert 'grok' not in provider_names  # Disabled
 
             # Step 3: Mock provider responses
-            mock_response = ProviderResponse(
-                provider_name="test",
-                model="test-model",
-                decision="BUY",
-                confidence=0.85,
-                reasoning="Test reasoning",
-                risk_level="medium",
-                latency_ms=100.0,
-                tokens_used=100,
-                cost_usd=0.01
-            )
-
-            for provider in available_providers:
-                provider.generate_signal = AsyncMock(return_value=mock_response)
+            attach_signal(available_providers, _MOCK_BUY)
 
             # Step 4: Generate consensus signal
             market_data = {
@@ -167,6 +180,20 @@ class TestProviderFactoryIntegration:
             orchestrator = MultiProviderOrchestrator(registry=registry)
             assert len(registry.get_available_providers()) == 3
 
+    async def test_registry_status_tracks_changes(self, full_env_config):
+        """Test registry status reflects providers being disabled or marked unavailable"""
+        with patch.dict(os.environ, full_env_config):
+            registry = ProviderFactory.initialize_registry()
+            assert registry.get_registry_status()['available_providers'] == 3
+
+            registry.disable_provider('anthropic')
+            assert registry.get_registry_status()['available_providers'] == 2
+
+            registry.get_provider('openai').set_status(ProviderStatus.UNAVAILABLE)
+            status = registry.get_registry_status()
+            assert status['available_providers'] == 1
+            assert status['providers_by_status']['unavailable'] == 1
+
     async def test_minimal_configuration(self):
         """Test that factory works with minimal configuration (API keys only)"""
         minimal_config = {
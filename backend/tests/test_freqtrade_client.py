@@ -6,6 +6,12 @@ from unittest.mock import Mock, patch, MagicMock
 from freqtrade_client.client import FreqtradeClient, FreqtradeClientError
 
 
+@pytest.fixture(scope="module")
+def offline_client():
+    """Mock-mode client shared by the mock-data tests"""
+    return FreqtradeClient(api_url="mock://")
+
+
 class TestFreqtradeClient:
     """Test suite for FreqtradeClient"""
 
@@ -38,10 +44,9 @@ class TestFreqtradeClient:
 
         assert 'Authorization' in client.session.headers
 
-    def test_get_summary_mock_data(self):
+    def test_get_summary_mock_data(self, offline_client):
         """Test get_summary returns mock data when Freqtrade unavailable"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        summary = client.get_summary()
+        summary = offline_client.get_summary()
 
         assert 'total_profit' in summary
         assert 'profit_24h' in summary
@@ -49,56 +54,57 @@ class TestFreqtradeClient:
         assert 'total_trades' in summary
         assert isinstance(summary['total_profit'], (int, float))
 
-    def test_get_bots_mock_data(self):
+    def test_get_bots_mock_data(self, offline_client):
         """Test get_bots returns mock data"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        bots = client.get_bots()
+        bots = offline_client.get_bots()
 
         assert isinstance(bots, list)
         assert len(bots) > 0
         assert 'bot_id' in bots[0]
         assert 'status' in bots[0]
 
-    def test_get_trades_mock_data(self):
+    def test_get_trades_mock_data(self, offline_client):
         """Test get_trades returns mock data"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        trades = client.get_trades()
+        trades = offline_client.get_trades()
 
         assert isinstance(trades, list)
         if len(trades) > 0:
             assert 'trade_id' in trades[0]
             assert 'pair' in trades[0]
 
-    def test_get_trades_with_pagination(self):
+    def test_get_trades_with_pagination(self, offline_client):
         """Test get_trades accepts pagination parameters"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        trades = client.get_trades(limit=5, offset=10)
+        trades = offline_client.get_trades(limit=5, offset=10)
 
         assert isinstance(trades, list)
 
-    def test_get_performance_mock_data(self):
+    def test_get_performance_mock_data(self, offline_client):
         """Test get_performance returns mock data"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        performance = client.get_performance()
+        performance = offline_client.get_performance()
 
         assert isinstance(performance, list)
 
-    def test_start_bot(self):
+    def test_start_bot(self, offline_client):
         """Test start_bot method"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        result = client.start_bot(1)
+        result = offline_client.start_bot(1)
 
-        assert 'status' in result
+        assert result['status'] == 'success'
         assert 'message' in result
 
-    def test_stop_bot(self):
+    def test_stop_bot(self, offline_client):
         """Test stop_bot method"""
-        client = FreqtradeClient(api_url="http://invalid:9999")
-        result = client.stop_bot(1)
+        result = offline_client.stop_bot(1)
 
-        assert 'status' in result
+        assert result['status'] == 'success'
         assert 'message' in result
 
+    def test_mock_url_enables_mock_mode(self, offline_client):
+        """Test mock:// URL skips HTTP and serves mock data"""
+        assert offline_client.mock is True
+        with patch.object(offline_client.session, 'request') as mock_request:
+            assert offline_client.get_bots() == offline_client._get_mock_bots()
+        mock_request.assert_not_called()
+
     def test_get_freqtrade_client_singleton(self):
         """Test singleton pattern for client"""
         from freqtrade_client.client import get_freqtrade_client
@@ -3,26 +3,39 @@ Unit tests for LLM Orchestrator
 """
 import pytest
 import json
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from llm_service.orchestrator import LLMOrchestrator, LLMOrchestratorError
 
 
+# Constant LLM payloads, serialized once at import
+_VALID_JSON = json.dumps({"decision": "BUY", "confidence": 0.85, "reasoning": "Test reasoning"})
+_INVALID_DECISION = json.dumps({"decision": "INVALID", "confidence": 0.85, "reasoning": "Test"})
+_INVALID_CONFIDENCE = json.dumps({"decision": "BUY", "confidence": 1.5, "reasoning": "Test"})  # > 1.0
+_MISSING_FIELDS = json.dumps({"decision": "BUY"})  # Missing confidence and reasoning
+_SIGNAL_JSON = json.dumps({
+    "decision": "BUY",
+    "confidence": 0.85,
+    "reasoning": "Strong bullish indicators",
+    "risk_level": "medium"
+})
+
+
 class TestLLMOrchestrator:
     """Test suite for LLMOrchestrator"""
 
+    @pytest.fixture(scope="class", autouse=True)
+    def _patch_anthropic(self):
+        """Patch the API key and Anthropic client once for the whole class"""
+        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'), \
+             patch('llm_service.orchestrator.Anthropic') as mock_anthropic_class:
+            type(self).anthropic_mock_class = mock_anthropic_class
+            yield
+
     @pytest.fixture
     def mock_anthropic_response(self):
         """Mock Anthropic API response"""
-        mock_message = Mock()
-        mock_content = Mock()
-        mock_content.text = json.dumps({
-            "decision": "BUY",
-            "confidence": 0.85,
-            "reasoning": "Strong bullish indicators",
-            "risk_level": "medium"
-        })
-        mock_message.content = [mock_content]
-        return mock_message
+        return SimpleNamespace(content=[SimpleNamespace(text=_SIGNAL_JSON)])
 
     @pytest.fixture
     def sample_market_data(self):
@@ -48,9 +61,7 @@ class TestLLMOrchestrator:
         with pytest.raises(LLMOrchestratorError):
             LLMOrchestrator(provider='invalid_provider')
 
-    @patch('llm_service.orchestrator.Anthropic')
-    @patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key')
-    def test_orchestrator_init_anthropic(self, mock_anthropic_class):
+    def test_orchestrator_init_anthropic(self):
         """Test orchestrator initializes with Anthropic"""
         orchestrator = LLMOrchestrator(provider='anthropic')
         assert orchestrator.provider == 'anthropic'
@@ -58,100 +69,62 @@ class TestLLMOrchestrator:
 
     def test_parse_llm_response_valid_json(self):
         """Test parsing valid JSON response"""
-        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'):
-            with patch('llm_service.orchestrator.Anthropic'):
-                orchestrator = LLMOrchestrator(provider='anthropic')
-
-                valid_response = json.dumps({
-                    "decision": "BUY",
-                    "confidence": 0.85,
-                    "reasoning": "Test reasoning"
-                })
+        orchestrator = LLMOrchestrator(provider='anthropic')
 
-                result = orchestrator._parse_llm_response(valid_response)
-                assert result['decision'] == 'BUY'
-                assert result['confidence'] == 0.85
+        result = orchestrator._parse_llm_response(_VALID_JSON)
+        assert result['decision'] == 'BUY'
+        assert result['confidence'] == 0.85
 
     def test_parse_llm_response_with_markdown(self):
         """Test parsing response with markdown code blocks"""
-        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'):
-            with patch('llm_service.orchestrator.Anthropic'):
-                orchestrator = LLMOrchestrator(provider='anthropic')
+        orchestrator = LLMOrchestrator(provider='anthropic')
 
-                markdown_response = """```json
-                {
-                    "decision": "SELL",
-                    "confidence": 0.75,
-                    "reasoning": "Test"
-                }
-                ```"""
+        markdown_response = """```json
+        {
+            "decision": "SELL",
+            "confidence": 0.75,
+            "reasoning": "Test"
+        }
+        ```"""
 
-                result = orchestrator._parse_llm_response(markdown_response)
-                assert result['decision'] == 'SELL'
+        result = orchestrator._parse_llm_response(markdown_response)
+        assert result['decision'] == 'SELL'
 
     def test_parse_llm_response_invalid_decision(self):
         """Test parsing response with invalid decision"""
-        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'):
-            with patch('llm_service.orchestrator.Anthropic'):
-                orchestrator = LLMOrchestrator(provider='anthropic')
-
-                invalid_response = json.dumps({
-                    "decision": "INVALID",
-                    "confidence": 0.85,
-                    "reasoning": "Test"
-                })
+        orchestrator = LLMOrchestrator(provider='anthropic')
 
-                with pytest.raises(LLMOrchestratorError):
-                    orchestrator._parse_llm_response(invalid_response)
+        with pytest.raises(LLMOrchestratorError):
+            orchestrator._parse_llm_response(_INVALID_DECISION)
 
     def test_parse_llm_response_invalid_confidence(self):
         """Test parsing response with invalid confidence"""
-        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'):
-            with patch('llm_service.orchestrator.Anthropic'):
-                orchestrator = LLMOrchestrator(provider='anthropic')
-
-                invalid_response = json.dumps({
-                    "decision": "BUY",
-                    "confidence": 1.5,  # Invalid: > 1.0
-                    "reasoning": "Test"
-                })
+        orchestrator = LLMOrchestrator(provider='anthropic')
 
-                with pytest.raises(LLMOrchestratorError):
-                    orchestrator._parse_llm_response(invalid_response)
+        with pytest.raises(LLMOrchestratorError):
+            orchestrator._parse_llm_response(_INVALID_CONFIDENCE)
 
     def test_parse_llm_response_missing_fields(self):
         """Test parsing response with missing required fields"""
-        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'):
-            with patch('llm_service.orchestrator.Anthropic'):
-                orchestrator = LLMOrchestrator(provider='anthropic')
-
-                incomplete_response = json.dumps({
-                    "decision": "BUY"
-                    # Missing confidence and reasoning
-                })
+        orchestrator = LLMOrchestrator(provider='anthropic')
 
-                with pytest.raises(LLMOrchestratorError):
-                    orchestrator._parse_llm_response(incomplete_response)
+        with pytest.raises(LLMOrchestratorError):
+            orchestrator._parse_llm_response(_MISSING_FIELDS)
 
     def test_format_market_data(self, sample_market_data):
         """Test market data formatting"""
-        with patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key'):
-            with patch('llm_service.orchestrator.Anthropic'):
-                orchestrator = LLMOrchestrator(provider='anthropic')
-
-                formatted = orchestrator._format_market_data(sample_market_data)
-                assert isinstance(formatted, str)
-                assert "rsi" in formatted
-                assert "45.2" in formatted
-
-    @patch('llm_service.orchestrator.Anthropic')
-    @patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key')
-    def test_generate_trading_signal(self, mock_anthropic_class, mock_anthropic_response, sample_market_data):
+        orchestrator = LLMOrchestrator(provider='anthropic')
+
+        formatted = orchestrator._format_market_data(sample_market_data)
+        assert isinstance(formatted, str)
+        assert "rsi" in formatted
+        assert "45.2" in formatted
+
+    def test_generate_trading_signal(self, mock_anthropic_response, sample_market_data):
         """Test full signal generation flow"""
         # Setup mock
-        mock_client = Mock()
+        mock_client = self.anthropic_mock_class.return_value
         mock_client.messages.create.return_value = mock_anthropic_response
-        mock_anthropic_class.return_value = mock_client
 
         orchestrator = LLMOrchestrator(provider='anthropic')
 
@@ -166,9 +139,7 @@ class TestLLMOrchestrator:
         assert 0 <= signal['confidence'] <= 1
         assert 'reasoning' in signal
 
-    @patch('llm_service.orchestrator.Anthropic')
-    @patch('django.conf.settings.ANTHROPIC_API_KEY', 'test-key')
-    def test_health_check(self, mock_anthropic_class):
+    def test_health_check(self):
         """Test health check returns configuration"""
         orchestrator = LLMOrchestrator(provider='anthropic')
         health = orchestrator.health_check()
@@ -3,95 +3,56 @@ Tests for Multi-Provider Orchestrator
 Comprehensive test suite for consensus-based multi-LLM orchestration
 """
 import pytest
-import asyncio
 from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import Mock, AsyncMock, patch
 
 from llm_service.multi_provider_orchestrator import MultiProviderOrchestrator
-from llm_service.providers.registry import ProviderRegistry
 from llm_service.providers.base import (
-    BaseLLMProvider,
-    ProviderConfig,
-    ProviderResponse,
-    ProviderStatus,
     ProviderError,
     ProviderTimeoutError,
     ProviderRateLimitError,
     ProviderAuthenticationError,
 )
 from llm_service.consensus.aggregator import ConsensusResult
+from tests.helpers import FakeProvider, make_providers, registry_with
 
 
 # Fixtures
 
-@pytest.fixture
-def mock_provider_config():
-    """Create a mock provider configuration"""
-    return ProviderConfig(
-        name="test_provider",
-        model="test-model",
-        api_key="test-key",
-        max_tokens=1024,
-        temperature=0.7,
-        timeout=30,
-        max_retries=3,
-        weight=1.0,
-        enabled=True,
-    )
-
-
-@pytest.fixture
-def mock_provider(mock_provider_config):
-    """Create a mock provider"""
-    provider = Mock(spec=BaseLLMProvider)
-    provider.config = mock_provider_config
-    provider.status = ProviderStatus.ACTIVE
-    provider.is_available = Mock(return_value=True)
-
-    # Mock generate_signal as async
-    async def mock_generate_signal(market_data, pair, timeframe, current_price):
-        return ProviderResponse(
-            provider_name=mock_provider_config.name,
-            model=mock_provider_config.model,
-            decision="BUY",
-            confidence=0.85,
-            reasoning="Test reasoning",
-            risk_level="medium",
-            suggested_stop_loss=45000.0,
-            suggested_take_profit=55000.0,
-            latency_ms=150.0,
-            tokens_used=500,
-            cost_usd=0.001,
-        )
+_REGISTRY_STATUS = {
+    "total_providers": 3,
+    "available_providers": 3,
+    "providers_by_status": {"active": 3},
+    "provider_names": ["anthropic", "openai", "gemini"],
+    "registered_classes": ["anthropic", "openai", "gemini"],
+}
 
-    provider.generate_signal = AsyncMock(side_effect=mock_generate_signal)
 
-    return provider
+async def _no_health_results():
+    return {}
 
 
 @pytest.fixture
 def mock_registry():
-    """Create a mock registry"""
-    registry = Mock(spec=ProviderRegistry)
-    registry.get_registry_status = Mock(return_value={
-        "total_providers": 3,
-        "available_providers": 3,
-        "providers_by_status": {"active": 3},
-        "provider_names": ["anthropic", "openai", "gemini"],
-        "registered_classes": ["anthropic", "openai", "gemini"],
-    })
-    return registry
+    """Create a lightweight stand-in registry; tests override methods as needed"""
+    return SimpleNamespace(
+        get_available_providers=lambda: [],
+        get_provider=lambda name: None,
+        get_registry_status=lambda: dict(_REGISTRY_STATUS),
+        health_check_all=_no_health_results,
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_market_data():
-    """Sample market data for testing"""
-    return {
+    """Sample market data for testing (read-only, shared by the module)"""
+    return MappingProxyType({
         "rsi": 65.5,
         "macd": 150.0,
         "volume": 1000000,
         "price_change_24h": 2.5,
-    }
+    })
 
 
 # Test Orchestrator Initialization
@@ -123,49 +84,16 @@ def test_orchestrator_default_initialization(mock_registry):
 
 # Test Successful Consensus Generation
 
-@pytest.mark.asyncio
-async def test_generate_consensus_signal_success(mock_registry, sample_market_data):
+async def test_generate_consensus_signal_success(sample_market_data):
     """Test successful consensus signal generation with multiple providers"""
-    # Create multiple mock providers
-    providers = []
-    for i, name in enumerate(["anthropic", "openai", "gemini"]):
-        provider = Mock(spec=BaseLLMProvider)
-        provider.config = ProviderConfig(
-            name=name,
-            model=f"model-{i}",
-            api_key="test-key",
-            weight=1.0,
-            enabled=True,
-        )
-        provider.status = ProviderStatus.ACTIVE
-        provider.is_available = Mock(return_value=True)
-
-        # Different decisions for testing consensus
-        decisions = ["BUY", "BUY", "HOLD"]
-
-        async def make_generate_signal(market_data, pair, timeframe, current_price, pname=name, dec=decisions[i]):
-            return ProviderResponse(
-                provider_name=pname,
-                model=f"model-{pname}",
-                decision=dec,
-                confidence=0.8,
-                reasoning=f"Reasoning from {pname}",
-                risk_level="medium",
-                latency_ms=100.0,
-                tokens_used=500,
-                cost_usd=0.001,
-            )
-
-        provider.generate_signal = AsyncMock(side_effect=make_generate_signal)
-        providers.append(provider)
-
-    mock_registry.get_available_providers = Mock(return_value=providers)
-    mock_registry.get_provider = Mock(side_effect=lambda name: next(
-        (p for p in providers if p.config.name == name), None
-    ))
+    # Different decisions for testing consensus
+    registry = registry_with([
+        FakeProvider(name=name, decision=decision, confidence=0.8)
+        for name, decision in [("anthropic", "BUY"), ("openai", "BUY"), ("gemini", "HOLD")]
+    ])
 
     orchestrator = MultiProviderOrchestrator(
-        registry=mock_registry,
+        registry=registry,
         min_providers=2,
     )
 
@@ -185,45 +113,12 @@ async def test_generate_consensus_signal_success(mock_registry, sample_market_da
     assert result.total_cost_usd > 0
 
 
-@pytest.mark.asyncio
-async def test_generate_consensus_signal_unanimous(mock_registry, sample_market_data):
+async def test_generate_consensus_signal_unanimous(sample_market_data):
     """Test consensus with unanimous decision"""
     # All providers vote BUY
-    providers = []
-    for name in ["anthropic", "openai", "gemini"]:
-        provider = Mock(spec=BaseLLMProvider)
-        provider.config = ProviderConfig(
-            name=name,
-            model=f"model-{name}",
-            api_key="test-key",
-            weight=1.0,
-            enabled=True,
-        )
-        provider.status = ProviderStatus.ACTIVE
-        provider.is_available = Mock(return_value=True)
-
-        async def make_generate_signal(market_data, pair, timeframe, current_price, pname=name):
-            return ProviderResponse(
-                provider_name=pname,
-                model=f"model-{pname}",
-                decision="BUY",
-                confidence=0.9,
-                reasoning=f"Strong buy signal from {pname}",
-                risk_level="low",
-                latency_ms=100.0,
-                tokens_used=500,
-                cost_usd=0.001,
-            )
-
-        provider.generate_signal = AsyncMock(side_effect=make_generate_signal)
-        providers.append(provider)
-
-    mock_registry.get_available_providers = Mock(return_value=providers)
-    mock_registry.get_provider = Mock(side_effect=lambda name: next(
-        (p for p in providers if p.config.name == name), None
-    ))
+    registry = registry_with(make_providers(names=["anthropic", "openai", "gemini"], confidence=0.9))
 
-    orchestrator = MultiProviderOrchestrator(registry=mock_registry)
+    orchestrator = MultiProviderOrchestrator(registry=registry)
 
     result = await orchestrator.generate_consensus_signal(
         market_data=sample_market_data,
@@ -239,7 +134,6 @@ async def test_generate_consensus_signal_unanimous(mock_registry, sample_market_
 
 # Test Error Handling
 
-@pytest.mark.asyncio
 async def test_no_available_providers(mock_registry, sample_market_data):
     """Test error when no providers are available"""
     mock_registry.get_available_providers = Mock(return_value=[])
@@ -255,23 +149,12 @@ async def test_no_available_providers(mock_registry, sample_market_data):
         )
 
 
-@pytest.mark.asyncio
-async def test_insufficient_available_providers(mock_registry, sample_market_data):
+async def test_insufficient_available_providers(sample_market_data):
     """Test error when insufficient providers are available"""
-    provider = Mock(spec=BaseLLMProvider)
-    provider.config = ProviderConfig(
-        name="only_provider",
-        model="model",
-        api_key="key",
-        enabled=True,
-    )
-    provider.status = ProviderStatus.ACTIVE
-    provider.is_available = Mock(return_value=True)
-
-    mock_registry.get_available_providers = Mock(return_value=[provider])
+    registry = registry_with(make_providers(names=["only_provider"]))
 
     orchestrator = MultiProviderOrchestrator(
-        registry=mock_registry,
+        registry=registry,
         min_providers=3,
     )
 
@@ -284,92 +167,16 @@ async def test_insufficient_available_providers(mock_registry, sample_market_dat
         )
 
 
-@pytest.mark.asyncio
-async def test_partial_provider_failures(mock_registry, sample_market_data):
+async def test_partial_provider_failures(sample_market_data):
     """Test handling of partial provider failures"""
-    providers = []
-
-    # Provider 1: Success
-    provider1 = Mock(spec=BaseLLMProvider)
-    provider1.config = ProviderConfig(
-        name="provider1",
-        model="model1",
-        api_key="key",
-        weight=1.0,
-        enabled=True,
-    )
-    provider1.status = ProviderStatus.ACTIVE
-    provider1.is_available = Mock(return_value=True)
-
-    async def success_generate(market_data, pair, timeframe, current_price):
-        return ProviderResponse(
-            provider_name="provider1",
-            model="model1",
-            decision="BUY",
-            confidence=0.85,
-            reasoning="Good signal",
-            risk_level="medium",
-            latency_ms=100.0,
-            tokens_used=500,
-            cost_usd=0.001,
-        )
-
-    provider1.generate_signal = success_generate
-    providers.append(provider1)
-
-    # Provider 2: Success
-    provider2 = Mock(spec=BaseLLMProvider)
-    provider2.config = ProviderConfig(
-        name="provider2",
-        model="model2",
-        api_key="key",
-        weight=1.0,
-        enabled=True,
-    )
-    provider2.status = ProviderStatus.ACTIVE
-    provider2.is_available = Mock(return_value=True)
-
-    async def success_generate2(market_data, pair, timeframe, current_price):
-        return ProviderResponse(
-            provider_name="provider2",
-            model="model2",
-            decision="BUY",
-            confidence=0.8,
-            reasoning="Good signal",
-            risk_level="medium",
-            latency_ms=100.0,
-            tokens_used=500,
-            cost_usd=0.001,
-        )
-
-    provider2.generate_signal = success_generate2
-    providers.append(provider2)
-
-    # Provider 3: Failure
-    provider3 = Mock(spec=BaseLLMProvider)
-    provider3.config = ProviderConfig(
-        name="provider3",
-        model="model3",
-        api_key="key",
-        weight=1.0,
-        enabled=True,
-    )
-    provider3.status = ProviderStatus.ACTIVE
-    provider3.is_available = Mock(return_value=True)
-
-    async def failure_generate(market_data, pair, timeframe, current_price):
-        raise ProviderTimeoutError("provider3", "Timeout error")
-
-    provider3.generate_signal = failure_generate
-    providers.append(provider3)
-
-    mock_registry.get_available_providers = Mock(return_value=providers)
-    mock_registry.get_provider = Mock(side_effect=lambda name: next(
-        (p for p in providers if p.config.name == name), None
-    ))
+    registry = registry_with([
+        FakeProvider(name="provider1", confidence=0.85),
+        FakeProvider(name="provider2", confidence=0.8),
+        FakeProvider(name="provider3", fail_with=ProviderTimeoutError("provider3", "Timeout error")),
+    ])
 
     orchestrator = MultiProviderOrchestrator(
-        registry=mock_registry,
+        registry=registry,
         min_providers=2,
     )
 
@@ -386,32 +193,15 @@ async def test_partial_provider_failures(mock_registry, sample_market_data):
     assert result.total_providers == 3
 
 
-@pytest.mark.asyncio
-async def test_all_providers_fail(mock_registry, sample_market_data):
+async def test_all_providers_fail(sample_market_data):
     """Test error when all providers fail"""
-    providers = []
-
-    for name in ["provider1", "provider2"]:
-        provider = Mock(spec=BaseLLMProvider)
-        provider.config = ProviderConfig(
-            name=name,
-            model="model",
-            api_key="key",
-            enabled=True,
-        )
-        provider.status = ProviderStatus.ACTIVE
-        provider.is_available = Mock(return_value=True)
-
-        async def failure_generate(market_data, pair, timeframe, current_price):
-            raise ProviderError(name, "API error")
-
-        provider.generate_signal = failure_generate
-        providers.append(provider)
-
-    mock_registry.get_available_providers = Mock(return_value=providers)
+    registry = registry_with([
+        FakeProvider(name=name, fail_with=ProviderError(name, "API error"))
+        for name in ["provider1", "provider2"]
+    ])
 
     orchestrator = MultiProviderOrchestrator(
-        registry=mock_registry,
+        registry=registry,
         min_providers=2,
     )
 
@@ -426,45 +216,11 @@ async def test_all_providers_fail(mock_registry, sample_market_data):
 
 # Test Provider Weights
 
-@pytest.mark.asyncio
-async def test_custom_provider_weights(mock_registry, sample_market_data):
+async def test_custom_provider_weights(sample_market_data):
     """Test consensus with custom provider weights"""
-    providers = []
-
-    for name in ["provider1", "provider2"]:
-        provider = Mock(spec=BaseLLMProvider)
-        provider.config = ProviderConfig(
-            name=name,
-            model=f"model-{name}",
-            api_key="key",
-            weight=1.0,
-            enabled=True,
-        )
-        provider.status = ProviderStatus.ACTIVE
-        provider.is_available = Mock(return_value=True)
-
-        async def make_generate(market_data, pair, timeframe, current_price, pname=name):
-            return ProviderResponse(
-                provider_name=pname,
-                model=f"model-{pname}",
-                decision="BUY",
-                confidence=0.8,
-                reasoning="Test",
-                risk_level="medium",
-                latency_ms=100.0,
-                tokens_used=500,
-                cost_usd=0.001,
-            )
-
-        provider.generate_signal = AsyncMock(side_effect=make_generate)
-        providers.append(provider)
-
-    mock_registry.get_available_providers = Mock(return_value=providers)
-    mock_registry.get_provider = Mock(side_effect=lambda name: next(
-        (p for p in providers if p.config.name == name), None
-    ))
+    registry = registry_with(make_providers(names=["provider1", "provider2"]))
 
-    orchestrator = MultiProviderOrchestrator(registry=mock_registry)
+    orchestrator = MultiProviderOrchestrator(registry=registry)
 
     # Use custom weights
     custom_weights = {
@@ -518,7 +274,6 @@ def test_reset_metrics(mock_registry):
 
 # Test Health Check
 
-@pytest.mark.asyncio
 async def test_health_check(mock_registry):
     """Test orchestrator health check"""
     mock_registry.health_check_all = AsyncMock(return_value={
@@ -541,7 +296,6 @@ async def test_health_check(mock_registry):
     assert "timestamp" in health
 
 
-@pytest.mark.asyncio
 async def test_health_check_degraded(mock_registry):
     """Test health check with degraded status"""
     mock_registry.health_check_all = AsyncMock(return_value={
@@ -564,40 +318,13 @@ async def test_health_check_degraded(mock_registry):
 
 # Test Timeout Handling
 
-@pytest.mark.asyncio
-async def test_orchestration_timeout(mock_registry, sample_market_data):
+async def test_orchestration_timeout(sample_market_data):
     """Test timeout for entire orchestration"""
-    provider = Mock(spec=BaseLLMProvider)
-    provider.config = ProviderConfig(
-        name="slow_provider",
-        model="model",
-        api_key="key",
-        enabled=True,
-    )
-    provider.status = ProviderStatus.ACTIVE
-    provider.is_available = Mock(return_value=True)
-
-    async def slow_generate(market_data, pair, timeframe, current_price):
-        await asyncio.sleep(10)  # Simulate slow provider
-        return ProviderResponse(
-            provider_name="slow_provider",
-            model="model",
-            decision="BUY",
-            confidence=0.8,
-            reasoning="Test",
-            risk_level="medium",
-            latency_ms=10000.0,
-            tokens_used=500,
-            cost_usd=0.001,
-        )
-
-    provider.generate_signal = slow_generate
-
-    mock_registry.get_available_providers = Mock(return_value=[provider])
+    registry = registry_with([FakeProvider(name="slow_provider", hang=True)])
 
     orchestrator = MultiProviderOrchestrator(
-        registry=mock_registry,
-        timeout_seconds=0.5,  # Very short timeout
+        registry=registry,
+        timeout_seconds=0.05,  # Very short timeout
     )
 
     with pytest.raises(ValueError, match="Insufficient successful provider responses"):
@@ -611,58 +338,21 @@ async def test_orchestration_timeout(mock_registry, sample_market_data):
 
 # Test Different Error Types
 
-@pytest.mark.asyncio
-async def test_authentication_error_handling(mock_registry, sample_market_data):
-    """Test handling of authentication errors"""
-    provider = Mock(spec=BaseLLMProvider)
-    provider.config = ProviderConfig(
-        name="auth_fail_provider",
-        model="model",
-        api_key="invalid_key",
-        enabled=True,
-    )
-    provider.status = ProviderStatus.ACTIVE
-    provider.is_available = Mock(return_value=True)
-
-    async def auth_fail_generate(market_data, pair, timeframe, current_price):
-        raise ProviderAuthenticationError("auth_fail_provider", "Invalid API key")
-
-    provider.generate_signal = auth_fail_generate
-
-    mock_registry.get_available_providers = Mock(return_value=[provider])
-
-    orchestrator = MultiProviderOrchestrator(registry=mock_registry)
-
-    with pytest.raises(ValueError, match="Insufficient successful provider responses"):
-        await orchestrator.generate_consensus_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="5m",
-            current_price=50000.0,
-        )
-
-
-@pytest.mark.asyncio
-async def test_rate_limit_error_handling(mock_registry, sample_market_data):
-    """Test handling of rate limit errors"""
-    provider = Mock(spec=BaseLLMProvider)
-    provider.config = ProviderConfig(
-        name="rate_limited_provider",
-        model="model",
-        api_key="key",
-        enabled=True,
-    )
-    provider.status = ProviderStatus.ACTIVE
-    provider.is_available = Mock(return_value=True)
-
-    async def rate_limit_generate(market_data, pair, timeframe, current_price):
-        raise ProviderRateLimitError("rate_limited_provider", "Rate limit exceeded")
-
-    provider.generate_signal = rate_limit_generate
-
-    mock_registry.get_available_providers = Mock(return_value=[provider])
+@pytest.mark.parametrize(
+    "exc",
+    [
+        ProviderAuthenticationError("failing_provider", "Invalid API key"),
+        ProviderRateLimitError("failing_provider", "Rate limit exceeded"),
+        ProviderTimeoutError("failing_provider", "Timeout error"),
+        ProviderError("failing_provider", "API error"),
+    ],
+    ids=["auth", "rate", "timeout", "generic"],
+)
+async def test_provider_failures_raise_insufficient(exc, sample_market_data):
+    """Test each provider error type leaves too few successful responses"""
+    registry = registry_with(make_providers(names=["failing_provider"], fail_with=exc))
 
-    orchestrator = MultiProviderOrchestrator(registry=mock_registry)
+    orchestrator = MultiProviderOrchestrator(registry=registry)
 
     with pytest.raises(ValueError, match="Insufficient successful provider responses"):
         await orchestrator.generate_consensus_signal(
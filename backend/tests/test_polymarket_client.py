@@ -10,9 +10,12 @@ This test suite covers:
 - Market data fetching
 """
 
+import asyncio
+import dataclasses
 import pytest
+import pytest_asyncio
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 import httpx
 
 from polymarket_client import (
@@ -37,11 +40,54 @@ from polymarket_client import (
 )
 
 
+async def _assert_raises(exc, awaitable):
+    """Await and assert it raises exc (for cases that don't inspect the exception)"""
+    try:
+        await awaitable
+    except exc:
+        return
+    pytest.fail(f"DID NOT RAISE {exc.__name__}")
+
+
 # ============================================================================
 # Model Tests
 # ============================================================================
 
 
+# Fixed timestamp wherever the actual "now" is irrelevant (deterministic round-trips)
+NOW = datetime(2030, 1, 1)
+
+# Valid baseline instances; validation tests swap in one bad field at a time
+_VALID_MARKET = Market(
+    id="test",
+    question="Test?",
+    description="Test",
+    end_date=NOW,
+    status=MarketStatus.ACTIVE,
+    yes_price=0.5,
+    no_price=0.5,
+)
+
+_VALID_ORDER = Order(
+    id="order_123",
+    market_id="market_456",
+    side=OrderSide.BUY,
+    outcome="YES",
+    order_type=OrderType.LIMIT,
+    status=OrderStatus.OPEN,
+    price=0.65,
+    size=100.0,
+)
+
+_VALID_POSITION = Position(
+    market_id="market_123",
+    outcome="YES",
+    size=100.0,
+    average_entry_price=0.65,
+    current_price=0.70,
+)
+
+
 class TestMarketModel:
     """Test Market data model."""
 
@@ -51,7 +97,7 @@ class TestMarketModel:
             id="test_market",
             question="Will BTC reach $50k?",
             description="BTC price market",
-            end_date=datetime.now() + timedelta(days=30),
+            end_date=NOW + timedelta(days=30),
             status=MarketStatus.ACTIVE,
             yes_price=0.65,
             no_price=0.35,
@@ -65,32 +111,16 @@ class TestMarketModel:
         assert market.implied_probability_yes == 0.65
         assert market.implied_probability_no == 0.35
 
-    def test_market_price_validation(self):
-        """Test Market price validation."""
-        with pytest.raises(ValueError, match="yes_price must be between"):
-            Market(
-                id="test",
-                question="Test?",
-                description="Test",
-                end_date=datetime.now(),
-                status=MarketStatus.ACTIVE,
-                yes_price=1.5,  # Invalid
-                no_price=0.5,
-            )
-
-    def test_market_volume_validation(self):
-        """Test Market volume validation."""
-        with pytest.raises(ValueError, match="volume must be non-negative"):
-            Market(
-                id="test",
-                question="Test?",
-                description="Test",
-                end_date=datetime.now(),
-                status=MarketStatus.ACTIVE,
-                yes_price=0.5,
-                no_price=0.5,
-                volume=-100,  # Invalid
-            )
+    @pytest.mark.parametrize("field,value,match", [
+        ("yes_price", 1.5, "yes_price must be between"),
+        ("no_price", -0.1, "no_price must be between"),
+        ("volume", -100, "volume must be non-negative"),
+        ("liquidity", -1, "liquidity must be non-negative"),
+    ])
+    def test_market_invalid(self, field, value, match):
+        """Test Market field validation."""
+        with pytest.raises(ValueError, match=match):
+            dataclasses.replace(_VALID_MARKET, **{field: value})
 
     def test_market_serialization(self):
         """Test Market to_dict and from_dict."""
@@ -98,7 +128,7 @@ class TestMarketModel:
             id="test_market",
             question="Test?",
             description="Test market",
-            end_date=datetime.now(),
+            end_date=NOW,
             status=MarketStatus.ACTIVE,
             yes_price=0.6,
             no_price=0.4,
@@ -111,6 +141,7 @@ class TestMarketModel:
         assert restored.question == original.question
         assert restored.yes_price == original.yes_price
         assert restored.status == original.status
+        assert restored.end_date == NOW
 
 
 class TestOrderModel:
@@ -156,33 +187,16 @@ class TestOrderModel:
         order.filled_size = 100.0
         assert order.fill_percentage == 1.0
 
-    def test_order_price_validation(self):
-        """Test Order price validation."""
-        with pytest.raises(ValueError, match="price must be between"):
-            Order(
-                id="order_123",
-                market_id="market_456",
-                side=OrderSide.BUY,
-                outcome="YES",
-                order_type=OrderType.LIMIT,
-                status=OrderStatus.OPEN,
-                price=1.5,  # Invalid
-                size=100.0,
-            )
-
-    def test_order_size_validation(self):
-        """Test Order size validation."""
-        with pytest.raises(ValueError, match="size must be positive"):
-            Order(
-                id="order_123",
-                market_id="market_456",
-                side=OrderSide.BUY,
-                outcome="YES",
-                order_type=OrderType.LIMIT,
-                status=OrderStatus.OPEN,
-                price=0.65,
-                size=-100.0,  # Invalid
-            )
+    @pytest.mark.parametrize("field,value,match", [
+        ("price", 1.5, "price must be between"),
+        ("size", -100.0, "size must be positive"),
+        ("filled_size", -1.0, "filled_size must be non-negative"),
+        ("filled_size", 150.0, "cannot exceed size"),
+    ])
+    def test_order_invalid(self, field, value, match):
+        """Test Order field validation."""
+        with pytest.raises(ValueError, match=match):
+            dataclasses.replace(_VALID_ORDER, **{field: value})
 
     def test_order_serialization(self):
         """Test Order to_dict and from_dict."""
@@ -256,6 +270,16 @@ class TestPositionModel:
         # PnL % = (25 / 50) * 100 = 50%
         assert position.pnl_percentage == 50.0
 
+    @pytest.mark.parametrize("field,value,match", [
+        ("size", -1.0, "size must be non-negative"),
+        ("average_entry_price", 1.5, "average_entry_price must be between"),
+        ("current_price", -0.1, "current_price must be between"),
+    ])
+    def test_position_invalid(self, field, value, match):
+        """Test Position field validation."""
+        with pytest.raises(ValueError, match=match):
+            dataclasses.replace(_VALID_POSITION, **{field: value})
+
     def test_position_serialization(self):
         """Test Position to_dict and from_dict."""
         original = Position(
@@ -279,7 +303,45 @@ class TestPositionModel:
 # ============================================================================
 
 
-@pytest.mark.asyncio
+@pytest.fixture(scope="session", autouse=True)
+def _warm_polymarket():
+    """Pay first-use costs (client init, httpx response decoding) before any test runs"""
+    # Model classes are already exercised by the _VALID_* constants at import
+    MockPolymarketClient()
+    _resp(200, _SAMPLE_MARKET_JSON).json()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def _shared_mock_client():
+    """One opened MockPolymarketClient, on the session loop the tests run on"""
+    client = await MockPolymarketClient(initial_balance=10000.0)._open()
+    try:
+        yield client
+    finally:
+        await client._close()
+
+
+@pytest.fixture(scope="session")
+def _mock_markets_snapshot(_shared_mock_client):
+    """Markets of the shared client before any test has touched them"""
+    return _shared_mock_client.snapshot_markets()
+
+
+@pytest.fixture
+def mock_client(_shared_mock_client, _mock_markets_snapshot):
+    """Shared mock client, reset to a clean state after every test"""
+    yield _shared_mock_client
+    _shared_mock_client.reset(preserve_markets=True)
+    # Undo price drift and custom markets left behind by the test
+    _shared_mock_client.restore_markets(_mock_markets_snapshot)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def sample_market_id(_shared_mock_client):
+    """Id of the first sample market (ids survive reset())"""
+    return (await _shared_mock_client.get_markets())[0].id
+
+
 class TestMockPolymarketClient:
     """Test MockPolymarketClient functionality."""
 
@@ -290,253 +352,214 @@ class TestMockPolymarketClient:
             assert balance["total"] == 5000.0
             assert balance["available"] == 5000.0
 
-    async def test_mock_get_markets(self):
+    async def test_mock_get_markets(self, mock_client):
         """Test fetching markets from mock client."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            assert len(markets) >= 3  # Should have sample markets
-            assert all(isinstance(m, Market) for m in markets)
+        markets = await mock_client.get_markets()
+        assert len(markets) >= 3  # Should have sample markets
+        assert all(isinstance(m, Market) for m in markets)
 
-    async def test_mock_get_market(self):
+    async def test_mock_get_market(self, mock_client, sample_market_id):
         """Test fetching specific market."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
+        market = await mock_client.get_market(sample_market_id)
+        assert market.id == sample_market_id
 
-            market = await client.get_market(market_id)
-            assert market.id == market_id
-
-    async def test_mock_market_not_found(self):
+    async def test_mock_market_not_found(self, mock_client):
         """Test market not found error."""
-        async with MockPolymarketClient() as client:
-            with pytest.raises(PolymarketMarketNotFoundError):
-                await client.get_market("nonexistent_market")
+        await _assert_raises(PolymarketMarketNotFoundError, mock_client.get_market("nonexistent_market"))
 
-    async def test_mock_get_market_prices(self):
+    async def test_mock_get_market_prices(self, mock_client, sample_market_id):
         """Test fetching market prices."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            prices = await client.get_market_prices(market_id)
-            assert "YES" in prices
-            assert "NO" in prices
-            assert 0.0 <= prices["YES"] <= 1.0
-            assert 0.0 <= prices["NO"] <= 1.0
-
-    async def test_mock_place_order(self):
-        """Test placing an order."""
-        async with MockPolymarketClient(initial_balance=10000.0) as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            order = await client.place_order(
-                market_id=market_id,
-                side=OrderSide.BUY,
-                outcome="YES",
-                price=0.65,
-                size=100.0,
-                order_type=OrderType.LIMIT,
-            )
-
-            assert order.id is not None
-            assert order.market_id == market_id
-            assert order.side == OrderSide.BUY
-            assert order.price == 0.65
-            assert order.size == 100.0
-            assert order.status in [OrderStatus.OPEN, OrderStatus.FILLED]
-
-    async def test_mock_place_market_order(self):
-        """Test placing a market order (should fill immediately)."""
-        async with MockPolymarketClient(initial_balance=10000.0) as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
+        prices = await mock_client.get_market_prices(sample_market_id)
+        assert "YES" in prices
+        assert "NO" in prices
+        assert 0.0 <= prices["YES"] <= 1.0
+        assert 0.0 <= prices["NO"] <= 1.0
+
+    @pytest.mark.parametrize("price,size,order_type,expected_exc,expected_status", [
+        (0.65, 100.0, OrderType.LIMIT, None, {OrderStatus.OPEN, OrderStatus.FILLED}),
+        # Market orders should be filled or partially filled
+        (0.65, 100.0, OrderType.MARKET, None, {OrderStatus.FILLED, OrderStatus.PARTIALLY_FILLED}),
+        (0.65, 100000.0, OrderType.LIMIT, PolymarketInsufficientFundsError, None),  # Too large
+        (1.5, 100.0, OrderType.LIMIT, PolymarketValidationError, None),  # Invalid price
+    ], ids=["limit", "market", "insufficient_funds", "invalid_price"])
+    async def test_mock_place_order(
+        self, mock_client, sample_market_id, price, size, order_type, expected_exc, expected_status
+    ):
+        """Test placing orders, including the rejected cases."""
+        place = mock_client.place_order(
+            market_id=sample_market_id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=price,
+            size=size,
+            order_type=order_type,
+        )
 
-            order = await client.place_order(
-                market_id=market_id,
-                side=OrderSide.BUY,
-                outcome="YES",
-                price=0.65,
-                size=100.0,
-                order_type=OrderType.MARKET,
-            )
+        if expected_exc is not None:
+            await _assert_raises(expected_exc, place)
+            return
 
-            # Market orders should be filled or partially filled
-            assert order.status in [OrderStatus.FILLED, OrderStatus.PARTIALLY_FILLED]
+        order = await place
+        assert order.id is not None
+        assert order.market_id == sample_market_id
+        assert order.side == OrderSide.BUY
+        assert order.price == price
+        assert order.size == size
+        assert order.status in expected_status
+        if order_type == OrderType.MARKET:
             assert order.filled_size > 0
 
-    async def test_mock_insufficient_funds(self):
-        """Test insufficient funds error."""
-        async with MockPolymarketClient(initial_balance=10.0) as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            with pytest.raises(PolymarketInsufficientFundsError):
-                await client.place_order(
-                    market_id=market_id,
-                    side=OrderSide.BUY,
-                    outcome="YES",
-                    price=0.65,
-                    size=1000.0,  # Too large
-                )
-
-    async def test_mock_invalid_order_price(self):
-        """Test invalid order price."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            with pytest.raises(PolymarketValidationError):
-                await client.place_order(
-                    market_id=market_id,
-                    side=OrderSide.BUY,
-                    outcome="YES",
-                    price=1.5,  # Invalid price
-                    size=100.0,
-                )
-
-    async def test_mock_cancel_order(self):
+    async def test_mock_cancel_order(self, mock_client, sample_market_id):
         """Test cancelling an order."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
+        # Place order
+        order = await mock_client.place_order(
+            market_id=sample_market_id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=0.65,
+            size=100.0,
+            order_type=OrderType.LIMIT,
+        )
 
-            # Place order
-            order = await client.place_order(
-                market_id=market_id,
+        # Cancel order
+        result = await mock_client.cancel_order(order.id)
+        assert result is True
+
+        # Check order status
+        cancelled_order = await mock_client.get_order(order.id)
+        assert cancelled_order.status == OrderStatus.CANCELLED
+
+    async def test_mock_get_orders(self, mock_client, sample_market_id):
+        """Test fetching orders."""
+        # Place some orders
+        await asyncio.gather(*[
+            mock_client.place_order(
+                market_id=sample_market_id,
                 side=OrderSide.BUY,
                 outcome="YES",
                 price=0.65,
-                size=100.0,
+                size=10.0,
                 order_type=OrderType.LIMIT,
             )
+            for _ in range(3)
+        ])
 
-            # Cancel order
-            result = await client.cancel_order(order.id)
-            assert result is True
+        # Fetch all orders
+        orders = await mock_client.get_orders()
+        assert len(orders) >= 3
 
-            # Check order status
-            cancelled_order = await client.get_order(order.id)
-            assert cancelled_order.status == OrderStatus.CANCELLED
+        # Fetch orders for specific market
+        market_orders = await mock_client.get_orders(market_id=sample_market_id)
+        assert len(market_orders) >= 3
+        assert all(o.market_id == sample_market_id for o in market_orders)
 
-    async def test_mock_get_orders(self):
-        """Test fetching orders."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            # Place some orders
-            for i in range(3):
-                await client.place_order(
-                    market_id=market_id,
-                    side=OrderSide.BUY,
-                    outcome="YES",
-                    price=0.65,
-                    size=10.0,
-                    order_type=OrderType.LIMIT,
-                )
-
-            # Fetch all orders
-            orders = await client.get_orders()
-            assert len(orders) >= 3
-
-            # Fetch orders for specific market
-            market_orders = await client.get_orders(market_id=market_id)
-            assert len(market_orders) >= 3
-            assert all(o.market_id == market_id for o in market_orders)
-
-    async def test_mock_get_positions(self):
+    async def test_mock_get_positions(self, mock_client, sample_market_id):
         """Test fetching positions."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            # Place and fill an order to create position
-            order = await client.place_order(
-                market_id=market_id,
-                side=OrderSide.BUY,
-                outcome="YES",
-                price=0.65,
-                size=100.0,
-                order_type=OrderType.MARKET,  # Market orders fill immediately
-            )
+        # Place and fill an order to create position
+        order = await mock_client.place_order(
+            market_id=sample_market_id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=0.65,
+            size=100.0,
+            order_type=OrderType.MARKET,  # Market orders fill immediately
+        )
 
-            # Get positions
-            positions = await client.get_positions()
+        # Get positions
+        positions = await mock_client.get_positions()
 
-            # Check if position was created (depends on fill)
-            if order.filled_size > 0:
-                assert len(positions) > 0
-                position = positions[0]
-                assert position.market_id == market_id
-                assert position.size > 0
+        # Check if position was created (depends on fill)
+        if order.filled_size > 0:
+            assert len(positions) > 0
+            position = positions[0]
+            assert position.market_id == sample_market_id
+            assert position.size > 0
 
-    async def test_mock_get_position(self):
+    async def test_mock_get_position(self, mock_client, sample_market_id):
         """Test fetching specific position."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            # Place and fill an order
-            await client.place_order(
-                market_id=market_id,
-                side=OrderSide.BUY,
-                outcome="YES",
-                price=0.65,
-                size=100.0,
-                order_type=OrderType.MARKET,
-            )
+        # Place and fill an order
+        await mock_client.place_order(
+            market_id=sample_market_id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=0.65,
+            size=100.0,
+            order_type=OrderType.MARKET,
+        )
 
-            # Get specific position
-            position = await client.get_position(market_id, "YES")
-            if position:  # Position exists if order was filled
-                assert position.market_id == market_id
-                assert position.outcome == "YES"
+        # Get specific position
+        position = await mock_client.get_position(sample_market_id, "YES")
+        if position:  # Position exists if order was filled
+            assert position.market_id == sample_market_id
+            assert position.outcome == "YES"
 
-    async def test_mock_get_balance(self):
+    async def test_mock_get_balance(self, mock_client):
         """Test fetching balance."""
-        async with MockPolymarketClient(initial_balance=10000.0) as client:
-            balance = await client.get_balance()
-            assert balance["total"] == 10000.0
-            assert balance["available"] <= 10000.0
-            assert "reserved" in balance
+        balance = await mock_client.get_balance()
+        assert balance["total"] == 10000.0
+        assert balance["available"] <= 10000.0
+        assert "reserved" in balance
 
-    async def test_mock_health_check(self):
+    async def test_mock_health_check(self, mock_client):
         """Test health check."""
-        async with MockPolymarketClient() as client:
-            result = await client.health_check()
-            assert result is True
+        result = await mock_client.health_check()
+        assert result is True
 
     async def test_mock_error_simulation(self):
         """Test error simulation."""
-        async with MockPolymarketClient(
-            simulate_errors=True,
-            error_probability=1.0  # Always simulate errors
-        ) as client:
-            with pytest.raises(PolymarketError):
-                await client.get_markets()
+        client = MockPolymarketClient(force_error=True)
+        await _assert_raises(PolymarketError, client.get_markets())
 
-    async def test_mock_reset(self):
+    async def test_mock_reset(self, mock_client, sample_market_id):
         """Test resetting mock client state."""
-        async with MockPolymarketClient() as client:
-            # Place an order
-            markets = await client.get_markets()
-            await client.place_order(
-                market_id=markets[0].id,
-                side=OrderSide.BUY,
-                outcome="YES",
-                price=0.65,
-                size=100.0,
-            )
+        # Place an order
+        await mock_client.place_order(
+            market_id=sample_market_id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=0.65,
+            size=100.0,
+        )
 
-            # Reset
-            client.reset()
+        # Reset
+        mock_client.reset()
 
-            # Check state is reset
-            orders = await client.get_orders()
-            assert len(orders) == 0
-            balance = await client.get_balance()
-            assert balance["available"] == 10000.0
+        # Check state is reset
+        orders = await mock_client.get_orders()
+        assert len(orders) == 0
+        balance = await mock_client.get_balance()
+        assert balance["available"] == 10000.0
+
+    async def test_mock_reset_keeps_custom_markets(self):
+        """Test reset restores the initial balance and keeps custom markets."""
+        client = MockPolymarketClient(initial_balance=500.0)
+        client.add_market(dataclasses.replace(_VALID_MARKET, id="custom_market"))
+
+        client.reset()
+        assert (await client.get_market("custom_market")).id == "custom_market"
+        assert (await client.get_balance())["available"] == 500.0
+
+    async def test_mock_reset_preserve_markets(self):
+        """Test reset can keep the current market prices."""
+        client = MockPolymarketClient()
+        market_id = client.snapshot_markets()[0].id
+        client.set_market_price(market_id, 0.42)
+
+        client.reset(preserve_markets=True)
+        assert (await client.get_market(market_id)).yes_price == 0.42
+
+    async def test_mock_restore_markets(self):
+        """Test restoring a market snapshot undoes price changes and custom markets."""
+        client = MockPolymarketClient()
+        snapshot = client.snapshot_markets()
+        market_id = snapshot[0].id
+        client.set_market_price(market_id, 0.42)
+        client.add_market(dataclasses.replace(_VALID_MARKET, id="custom_market"))
+
+        client.restore_markets(snapshot)
+        assert (await client.get_market(market_id)).yes_price == snapshot[0].yes_price
+        with pytest.raises(PolymarketMarketNotFoundError):
+            await client.get_market("custom_market")
 
 
 # ============================================================================
@@ -544,7 +567,39 @@ class TestMockPolymarketClient:
 # ============================================================================
 
 
-@pytest.mark.asyncio
+_REQUEST = httpx.Request("GET", PolymarketClient.BASE_URL)
+
+
+def _resp(status, body=None, headers=None):
+    """Build a real httpx.Response carrying a JSON body"""
+    return httpx.Response(status, json=body, headers=headers, request=_REQUEST)
+
+
+# Response bodies are built once at import and shared by every test
+_SAMPLE_MARKET_JSON = [
+    {
+        "id": "market_1",
+        "question": "Test?",
+        "description": "Test market",
+        "end_date": NOW.isoformat(),
+        "status": "ACTIVE",
+        "yes_price": 0.65,
+        "no_price": 0.35,
+    }
+]
+_UNAUTHORIZED = _resp(401, {"error": "Invalid API key"})
+_RATE_LIMITED = _resp(429, {"error": "Rate limit exceeded"}, headers={"Retry-After": "60"})
+_BAD_REQUEST = _resp(400, {"message": "Invalid parameters"})
+_SERVER_ERROR = _resp(500, {"error": "Server error"})
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client():
+    """One opened client on the session loop; tests patch only the request method"""
+    async with PolymarketClient(api_key="test", max_retries=0) as client:
+        yield client
+
+
 class TestPolymarketClient:
     """Test PolymarketClient with mocked HTTP requests."""
 
@@ -558,103 +613,52 @@ class TestPolymarketClient:
         assert client.api_secret == "test_secret"
 
     @patch("httpx.AsyncClient.request")
-    async def test_get_markets_success(self, mock_request):
+    async def test_get_markets_success(self, mock_request, http_client):
         """Test successful markets fetch."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {
-                "id": "market_1",
-                "question": "Test?",
-                "description": "Test market",
-                "end_date": datetime.now().isoformat(),
-                "status": "ACTIVE",
-                "yes_price": 0.65,
-                "no_price": 0.35,
-            }
-        ]
-        mock_request.return_value = mock_response
+        mock_request.return_value = _resp(200, _SAMPLE_MARKET_JSON)
 
-        async with PolymarketClient(api_key="test") as client:
-            markets = await client.get_markets()
-            assert len(markets) == 1
-            assert markets[0].id == "market_1"
+        markets = await http_client.get_markets()
+        assert len(markets) == 1
+        assert markets[0].id == "market_1"
+
+    @pytest.mark.parametrize("response,exc,attrs", [
+        (_RATE_LIMITED, PolymarketRateLimitError, {"retry_after": 60}),
+        (_BAD_REQUEST, PolymarketValidationError, {}),
+        (_SERVER_ERROR, PolymarketAPIError, {}),
+    ], ids=["rate_limit", "validation", "server"])
+    @patch("httpx.AsyncClient.request")
+    async def test_http_error(self, mock_request, http_client, response, exc, attrs):
+        """Test mapping of HTTP error statuses to client exceptions."""
+        mock_request.return_value = response
+
+        with pytest.raises(exc) as exc_info:
+            await http_client.get_markets()
+        for name, value in attrs.items():
+            assert getattr(exc_info.value, name) == value
 
     @patch("httpx.AsyncClient.request")
     async def test_authentication_error(self, mock_request):
         """Test authentication error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.text = "Unauthorized"
-        mock_response.json.return_value = {"error": "Invalid API key"}
-        mock_request.return_value = mock_response
+        mock_request.return_value = _UNAUTHORIZED
 
-        async with PolymarketClient(api_key="invalid") as client:
+        async with PolymarketClient(api_key="invalid", max_retries=0) as client:
             with pytest.raises(PolymarketAuthenticationError):
                 await client.get_markets()
 
     @patch("httpx.AsyncClient.request")
-    async def test_rate_limit_error(self, mock_request):
-        """Test rate limit error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 429
-        mock_response.headers = {"Retry-After": "60"}
-        mock_response.text = "Rate limited"
-        mock_response.json.return_value = {"error": "Rate limit exceeded"}
-        mock_request.return_value = mock_response
-
-        async with PolymarketClient(api_key="test", max_retries=0) as client:
-            with pytest.raises(PolymarketRateLimitError) as exc_info:
-                await client.get_markets()
-            assert exc_info.value.retry_after == 60
-
-    @patch("httpx.AsyncClient.request")
-    async def test_timeout_error(self, mock_request):
+    async def test_timeout_error(self, mock_request, http_client):
         """Test timeout error handling."""
         mock_request.side_effect = httpx.TimeoutException("Timeout")
 
-        async with PolymarketClient(api_key="test", max_retries=0) as client:
-            with pytest.raises(PolymarketTimeoutError):
-                await client.get_markets()
-
-    @patch("httpx.AsyncClient.request")
-    async def test_validation_error(self, mock_request):
-        """Test validation error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad request"
-        mock_response.json.return_value = {"message": "Invalid parameters"}
-        mock_request.return_value = mock_response
-
-        async with PolymarketClient(api_key="test") as client:
-            with pytest.raises(PolymarketValidationError):
-                await client.get_markets()
-
-    @patch("httpx.AsyncClient.request")
-    async def test_server_error(self, mock_request):
-        """Test server error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal server error"
-        mock_response.json.return_value = {"error": "Server error"}
-        mock_request.return_value = mock_response
-
-        async with PolymarketClient(api_key="test", max_retries=0) as client:
-            with pytest.raises(PolymarketAPIError):
-                await client.get_markets()
+        await _assert_raises(PolymarketTimeoutError, http_client.get_markets())
 
     @patch("httpx.AsyncClient.request")
-    async def test_retry_logic(self, mock_request):
+    @patch("polymarket_client.client._sleep", new_callable=AsyncMock)
+    async def test_retry_logic(self, mock_sleep, mock_request):
         """Test retry logic for transient errors."""
         # First two calls fail, third succeeds
-        mock_response_fail = MagicMock()
-        mock_response_fail.status_code = 500
-        mock_response_fail.text = "Error"
-        mock_response_fail.json.return_value = {}
-
-        mock_response_success = MagicMock()
-        mock_response_success.status_code = 200
-        mock_response_success.json.return_value = []
+        mock_response_fail = _resp(500, {})
+        mock_response_success = _resp(200, [])
 
         mock_request.side_effect = [
             mock_response_fail,
@@ -666,6 +670,8 @@ class TestPolymarketClient:
             markets = await client.get_markets()
             assert isinstance(markets, list)
             assert mock_request.call_count == 3
+            # Exponential backoff between attempts, without the real wait
+            assert [c.args[0] for c in mock_sleep.await_args_list] == [1, 2]
 
 
 # ============================================================================
@@ -673,108 +679,98 @@ class TestPolymarketClient:
 # ============================================================================
 
 
-@pytest.mark.asyncio
 class TestPolymarketIntegration:
     """Integration tests using mock client."""
 
-    async def test_full_trading_workflow(self):
+    async def test_full_trading_workflow(self, mock_client):
         """Test complete trading workflow."""
-        async with MockPolymarketClient(initial_balance=10000.0) as client:
-            # 1. Fetch markets
-            markets = await client.get_markets()
-            assert len(markets) > 0
-            market = markets[0]
+        # 1. Fetch markets
+        markets = await mock_client.get_markets()
+        assert len(markets) > 0
+        market = markets[0]
+
+        # 2. Check prices
+        prices = await mock_client.get_market_prices(market.id)
+        assert "YES" in prices
+
+        # 3. Check balance
+        initial_balance = await mock_client.get_balance()
+        assert initial_balance["available"] == 10000.0
+
+        # 4. Place order
+        order = await mock_client.place_order(
+            market_id=market.id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=0.65,
+            size=100.0,
+            order_type=OrderType.MARKET,
+        )
+        assert order.id is not None
 
-            # 2. Check prices
-            prices = await client.get_market_prices(market.id)
-            assert "YES" in prices
+        # 5. Check balance after order
+        new_balance = await mock_client.get_balance()
+        assert new_balance["available"] < initial_balance["available"]
 
-            # 3. Check balance
-            initial_balance = await client.get_balance()
-            assert initial_balance["available"] == 10000.0
+        # 6. Get orders
+        orders = await mock_client.get_orders(market_id=market.id)
+        assert len(orders) > 0
 
-            # 4. Place order
-            order = await client.place_order(
-                market_id=market.id,
+        # 7. Get positions
+        positions = await mock_client.get_positions(market_id=market.id)
+        if order.filled_size > 0:
+            assert len(positions) > 0
+
+    async def test_multiple_orders_same_market(self, mock_client, sample_market_id):
+        """Test placing multiple orders in the same market."""
+        # Place 3 orders
+        orders = await asyncio.gather(*[
+            mock_client.place_order(
+                market_id=sample_market_id,
                 side=OrderSide.BUY,
                 outcome="YES",
-                price=0.65,
-                size=100.0,
-                order_type=OrderType.MARKET,
+                price=0.60 + (i * 0.01),
+                size=50.0,
+                order_type=OrderType.LIMIT,
             )
-            assert order.id is not None
-
-            # 5. Check balance after order
-            new_balance = await client.get_balance()
-            assert new_balance["available"] < initial_balance["available"]
+            for i in range(3)
+        ])
 
-            # 6. Get orders
-            orders = await client.get_orders(market_id=market.id)
-            assert len(orders) > 0
+        # Verify all orders created
+        assert len(orders) == 3
+        assert all(o.market_id == sample_market_id for o in orders)
 
-            # 7. Get positions
-            positions = await client.get_positions(market_id=market.id)
-            if order.filled_size > 0:
-                assert len(positions) > 0
+        # Fetch orders
+        fetched_orders = await mock_client.get_orders(market_id=sample_market_id)
+        assert len(fetched_orders) >= 3
 
-    async def test_multiple_orders_same_market(self):
-        """Test placing multiple orders in the same market."""
-        async with MockPolymarketClient(initial_balance=10000.0) as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            # Place 3 orders
-            orders = []
-            for i in range(3):
-                order = await client.place_order(
-                    market_id=market_id,
-                    side=OrderSide.BUY,
-                    outcome="YES",
-                    price=0.60 + (i * 0.01),
-                    size=50.0,
-                    order_type=OrderType.LIMIT,
-                )
-                orders.append(order)
-
-            # Verify all orders created
-            assert len(orders) == 3
-            assert all(o.market_id == market_id for o in orders)
-
-            # Fetch orders
-            fetched_orders = await client.get_orders(market_id=market_id)
-            assert len(fetched_orders) >= 3
-
-    async def test_order_lifecycle(self):
+    async def test_order_lifecycle(self, mock_client, sample_market_id):
         """Test complete order lifecycle."""
-        async with MockPolymarketClient() as client:
-            markets = await client.get_markets()
-            market_id = markets[0].id
-
-            # Place order
-            order = await client.place_order(
-                market_id=market_id,
-                side=OrderSide.BUY,
-                outcome="YES",
-                price=0.65,
-                size=100.0,
-                order_type=OrderType.LIMIT,
-            )
+        # Place order
+        order = await mock_client.place_order(
+            market_id=sample_market_id,
+            side=OrderSide.BUY,
+            outcome="YES",
+            price=0.65,
+            size=100.0,
+            order_type=OrderType.LIMIT,
+        )
 
-            # Verify order is open
-            assert order.status in [OrderStatus.OPEN, OrderStatus.FILLED]
+        # Verify order is open
+        assert order.status in [OrderStatus.OPEN, OrderStatus.FILLED]
 
-            # Get order details
-            fetched_order = await client.get_order(order.id)
-            assert fetched_order.id == order.id
+        # Get order details
+        fetched_order = await mock_client.get_order(order.id)
+        assert fetched_order.id == order.id
 
-            # Cancel order (if still open)
-            if order.status == OrderStatus.OPEN:
-                cancelled = await client.cancel_order(order.id)
-                assert cancelled is True
+        # Cancel order (if still open)
+        if order.status == OrderStatus.OPEN:
+            cancelled = await mock_client.cancel_order(order.id)
+            assert cancelled is True
 
-                # Verify cancellation
-                updated_order = await client.get_order(order.id)
-                assert updated_order.status == OrderStatus.CANCELLED
+            # Verify cancellation
+            updated_order = await mock_client.get_order(order.id)
+            assert updated_order.status == OrderStatus.CANCELLED
 
 
 if __name__ == "__main__":
@@ -2,12 +2,23 @@
 Comprehensive Unit Tests for LLM Providers
 Tests all 4 providers: Anthropic, OpenAI, Gemini, Grok
 Mock external API calls and test success/failure scenarios
+
+Async tests share the session-scoped event loop set up in conftest.py.
 """
 import pytest
 import json
+import numpy as np
+import math
+import re
 import asyncio
-from unittest.mock import AsyncMock, Mock, patch, MagicMock
+import copy
+from contextlib import ExitStack
+from dataclasses import replace
+from functools import lru_cache
+from unittest.mock import AsyncMock, patch
 from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, NamedTuple
 
 from llm_service.providers.base import (
     BaseLLMProvider,
@@ -18,6 +29,7 @@ from llm_service.providers.base import (
     ProviderRateLimitError,
     ProviderAuthenticationError,
     ProviderStatus,
+    VALID_DECISIONS,
 )
 from llm_service.providers.anthropic_provider import AnthropicProvider
 from llm_service.providers.openai_provider import OpenAIProvider
@@ -25,9 +37,94 @@ from llm_service.providers.gemini_provider import GeminiProvider
 from llm_service.providers.grok_provider import GrokProvider
 
 
+VALID_JSON_OBJ = {
+    "decision": "BUY",
+    "confidence": 0.85,
+    "reasoning": "Strong bullish indicators with RSI showing momentum",
+    "risk_level": "medium",
+    "suggested_stop_loss": 48000.0,
+    "suggested_take_profit": 51000.0
+}
+VALID_JSON_TEXT = json.dumps(VALID_JSON_OBJ)
+
+_INVALID_DECISION_TEXT = json.dumps({"decision": "MAYBE", "confidence": 0.5, "reasoning": "Not sure"})
+_INVALID_CONFIDENCE_TEXT = json.dumps({"decision": "BUY", "confidence": 1.5, "reasoning": "Very confident!"})
+_INCOMPLETE_TEXT = json.dumps({"decision": "BUY"})  # Missing confidence and reasoning
+_NO_USAGE_TEXT = json.dumps({"decision": "BUY", "confidence": 0.8, "reasoning": "Test"})
+_DECISION_TEXTS = {
+    decision: json.dumps(
+        {"decision": decision, "confidence": 0.75, "reasoning": f"Testing {decision} decision"}
+    )
+    # Sorted so parametrize ids match across xdist workers despite str hash randomisation
+    for decision in sorted(VALID_DECISIONS)
+}
+
+# Two fenced JSON blocks; providers should act on the first
+_MULTI_BLOCK_TEXT = """
+Here's my analysis:
+
+```json
+{
+    "decision": "BUY",
+    "confidence": 0.9,
+    "reasoning": "Strong buy signal"
+}
+```
+
+And here's another analysis:
+
+```json
+{
+    "decision": "SELL",
+    "confidence": 0.1,
+    "reasoning": "Ignore this"
+}
+```
+"""
+
+# ProviderError messages are "<provider_name>: <message>"
+_PROVIDER_ERR_RE = re.compile(r"test_provider.*Wrapped error message")
+
+# gpt-4o: 1000 prompt tokens at $5/1M + 500 completion tokens at $15/1M
+GPT4O_1K_500_COST = 5e-3 + 7.5e-3
+
+
+_SHARED_CONFIG = {
+    "max_tokens": 1024,
+    "temperature": 0.7,
+    "timeout": 30,
+    "max_retries": 3,
+    "enabled": True,
+}
+PROVIDER_DEFAULTS = {
+    "anthropic": {"model": "claude-3-5-sonnet-20241022", "api_key": "test_anthropic_key", "weight": 1.0},
+    "openai": {"model": "gpt-4-turbo", "api_key": "test_openai_key", "weight": 1.0},
+    "gemini": {"model": "gemini-1.5-pro", "api_key": "test_gemini_key", "weight": 0.8},
+    "grok": {
+        "model": "grok-beta",
+        "api_key": "test_grok_key",
+        "weight": 0.7,
+        "base_url": "https://api.x.ai/v1",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _validated_config(name, **overrides):
+    """ProviderConfig for ``name`` built (and validated) once from PROVIDER_DEFAULTS plus any overrides"""
+    return ProviderConfig(name=name, **{**_SHARED_CONFIG, **PROVIDER_DEFAULTS[name], **overrides})
+
+
+def make_config(name, **overrides):
+    """Fresh copy of the validated config, so callers never share a mutable ProviderConfig"""
+    config = copy.copy(_validated_config(name, **overrides))
+    config.extra_params = dict(config.extra_params)
+    return config
+
+
 # ==================== FIXTURES ====================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_market_data():
     """Sample market data for testing"""
     return {
@@ -43,85 +140,19 @@ def sample_market_data():
     }
 
 
-@pytest.fixture
-def anthropic_config():
-    """Anthropic provider configuration"""
-    return ProviderConfig(
-        name="anthropic",
-        model="claude-3-5-sonnet-20241022",
-        api_key="test_anthropic_key",
-        max_tokens=1024,
-        temperature=0.7,
-        timeout=30,
-        max_retries=3,
-        weight=1.0,
-        enabled=True,
-    )
-
-
-@pytest.fixture
-def openai_config():
-    """OpenAI provider configuration"""
-    return ProviderConfig(
-        name="openai",
-        model="gpt-4-turbo",
-        api_key="test_openai_key",
-        max_tokens=1024,
-        temperature=0.7,
-        timeout=30,
-        max_retries=3,
-        weight=1.0,
-        enabled=True,
-    )
-
-
-@pytest.fixture
-def gemini_config():
-    """Gemini provider configuration"""
-    return ProviderConfig(
-        name="gemini",
-        model="gemini-1.5-pro",
-        api_key="test_gemini_key",
-        max_tokens=1024,
-        temperature=0.7,
-        timeout=30,
-        max_retries=3,
-        weight=0.8,
-        enabled=True,
-    )
-
-
-@pytest.fixture
-def grok_config():
-    """Grok provider configuration"""
-    return ProviderConfig(
-        name="grok",
-        model="grok-beta",
-        api_key="test_grok_key",
-        max_tokens=1024,
-        temperature=0.7,
-        timeout=30,
-        max_retries=3,
-        weight=0.7,
-        enabled=True,
-        base_url="https://api.x.ai/v1",
-    )
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_json_response():
     """Valid JSON response from LLM"""
-    return {
-        "decision": "BUY",
-        "confidence": 0.85,
-        "reasoning": "Strong bullish indicators with RSI showing momentum",
-        "risk_level": "medium",
-        "suggested_stop_loss": 48000.0,
-        "suggested_take_profit": 51000.0
-    }
+    return VALID_JSON_OBJ
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def valid_json_text():
+    """Valid JSON response as returned by the LLM"""
+    return VALID_JSON_TEXT
+
+
+@pytest.fixture(scope="session")
 def valid_json_response_markdown():
     """Valid JSON response wrapped in markdown code blocks"""
     return """```json
@@ -134,564 +165,400 @@ def valid_json_response_markdown():
 ```"""
 
 
-# ==================== ANTHROPIC PROVIDER TESTS ====================
-
-@pytest.mark.asyncio
-async def test_anthropic_generate_signal_success(anthropic_config, sample_market_data, valid_json_response):
-    """Test successful signal generation with Anthropic"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.content = [Mock(text=json.dumps(valid_json_response))]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-        mock_response.stop_reason = "end_turn"
-
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
-
-        # Create provider and generate signal
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client  # Use mocked client
-
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h",
-            current_price=49500.0
-        )
-
-        # Assertions
-        assert isinstance(response, ProviderResponse)
-        assert response.provider_name == "anthropic"
-        assert response.decision == "BUY"
-        assert response.confidence == 0.85
-        assert response.reasoning == "Strong bullish indicators with RSI showing momentum"
-        assert response.risk_level == "medium"
-        assert response.suggested_stop_loss == 48000.0
-        assert response.suggested_take_profit == 51000.0
-        assert response.tokens_used == 700
-        assert response.cost_usd > 0
-        assert response.latency_ms > 0
-
-
-@pytest.mark.asyncio
-async def test_anthropic_generate_signal_markdown_wrapped(anthropic_config, sample_market_data, valid_json_response_markdown):
-    """Test Anthropic parsing markdown-wrapped JSON"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_response = Mock()
-        mock_response.content = [Mock(text=valid_json_response_markdown)]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-        mock_response.stop_reason = "end_turn"
-
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
-
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
-
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h",
-            current_price=49500.0
+@pytest.fixture(scope="module", autouse=True)
+def patched_sdks():
+    """Patch every provider SDK entry point once for the whole module"""
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            anthropic=stack.enter_context(patch('llm_service.providers.anthropic_provider.AsyncAnthropic')),
+            openai=stack.enter_context(patch('llm_service.providers.openai_provider.AsyncOpenAI')),
+            gemini=stack.enter_context(patch('llm_service.providers.gemini_provider.genai')),
+            grok=stack.enter_context(patch('llm_service.providers.grok_provider.AsyncOpenAI')),
         )
 
-        assert response.decision == "SELL"
-        assert response.confidence == 0.72
-
-
-@pytest.mark.asyncio
-async def test_anthropic_generate_signal_invalid_json(anthropic_config, sample_market_data):
-    """Test Anthropic handling invalid JSON response"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_response = Mock()
-        mock_response.content = [Mock(text="This is not JSON at all!")]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
 
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
-
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
-
-        with pytest.raises(ProviderError) as exc_info:
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
-
-        # Error message includes retry logic information
-        assert "Could not extract valid JSON" in str(exc_info.value)
-
-
-@pytest.mark.asyncio
-async def test_anthropic_generate_signal_missing_fields(anthropic_config, sample_market_data):
-    """Test Anthropic handling response with missing required fields"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        incomplete_response = {"decision": "BUY"}  # Missing confidence and reasoning
-
-        mock_response = Mock()
-        mock_response.content = [Mock(text=json.dumps(incomplete_response))]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
+def _restoring(provider):
+    """Yield a shared provider, then undo the swaps, status and metrics a test left behind"""
+    saved = {
+        name: getattr(provider, name)
+        for name in ("client", "model", "config", "max_retries")
+        if hasattr(provider, name)
+    }
+    yield provider
+    for name, value in saved.items():
+        setattr(provider, name, value)
+    provider.status = ProviderStatus.ACTIVE
+    provider._request_count = 0
+    provider._error_count = 0
+    provider._total_latency = 0.0
+    provider._last_error = None
+    provider._last_request_time = None
 
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
+@pytest.fixture(scope="module")
+def _shared_anthropic_provider(patched_sdks):
+    return AnthropicProvider(make_config("anthropic"))
 
-        with pytest.raises(ProviderError):
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
 
+@pytest.fixture(scope="module")
+def _shared_openai_provider(patched_sdks):
+    return OpenAIProvider(make_config("openai"))
 
-@pytest.mark.asyncio
-async def test_anthropic_health_check_success(anthropic_config):
-    """Test Anthropic health check success"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_response = Mock()
-        mock_response.content = [Mock(text="pong")]
 
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
+@pytest.fixture(scope="module")
+def _shared_gemini_provider(patched_sdks):
+    return GeminiProvider(make_config("gemini"))
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
 
-        result = await provider.health_check()
-        assert result is True
+@pytest.fixture(scope="module")
+def _shared_grok_provider(patched_sdks):
+    return GrokProvider(make_config("grok"))
 
 
-@pytest.mark.asyncio
-async def test_anthropic_health_check_failure(anthropic_config):
-    """Test Anthropic health check failure"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(side_effect=Exception("API Error"))
-        mock_anthropic.return_value = mock_client
+@pytest.fixture(scope="module")
+def _shared_anthropic_no_retry_provider(patched_sdks):
+    # Anthropic's max_retries counts attempts, so 1 means a single call
+    return AnthropicProvider(make_config("anthropic", max_retries=1))
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
 
-        result = await provider.health_check()
-        assert result is False
+@pytest.fixture(scope="module")
+def _shared_openai_no_retry_provider(patched_sdks):
+    provider = OpenAIProvider(make_config("openai"))
+    # config.max_retries=0 falls back to DEFAULT_MAX_RETRIES, so disable on the instance
+    provider.max_retries = 0
+    return provider
 
 
-def test_anthropic_estimate_cost(anthropic_config):
-    """Test Anthropic cost estimation"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
-
-        # Test with claude-3-5-sonnet pricing: $3/M input, $15/M output
-        cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
-        expected_cost = (1000 / 1_000_000 * 3.0) + (500 / 1_000_000 * 15.0)
-        assert abs(cost - expected_cost) < 0.0001
-
+@pytest.fixture
+def anthropic_provider(_shared_anthropic_provider):
+    """Anthropic provider shared by tests that install their own client"""
+    yield from _restoring(_shared_anthropic_provider)
 
-# ==================== OPENAI PROVIDER TESTS ====================
 
-@pytest.mark.asyncio
-async def test_openai_generate_signal_success(openai_config, sample_market_data, valid_json_response):
-    """Test successful signal generation with OpenAI"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai:
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=json.dumps(valid_json_response)), finish_reason="stop")]
-        mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
+@pytest.fixture
+def openai_provider(_shared_openai_provider):
+    """OpenAI provider shared by tests that install their own client"""
+    yield from _restoring(_shared_openai_provider)
 
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
 
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
+@pytest.fixture
+def gemini_provider(_shared_gemini_provider):
+    """Gemini provider shared by tests that install their own model"""
+    yield from _restoring(_shared_gemini_provider)
 
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="ETH/USDT",
-            timeframe="5m",
-            current_price=3200.0
-        )
 
-        assert isinstance(response, ProviderResponse)
-        assert response.provider_name == "openai"
-        assert response.decision == "BUY"
-        assert response.confidence == 0.85
-        assert response.tokens_used == 700
-        assert response.cost_usd > 0
+@pytest.fixture
+def grok_provider(_shared_grok_provider):
+    """Grok provider shared by tests that install their own client"""
+    yield from _restoring(_shared_grok_provider)
 
 
-@pytest.mark.asyncio
-async def test_openai_generate_signal_markdown_wrapped(openai_config, sample_market_data, valid_json_response_markdown):
-    """Test OpenAI parsing markdown-wrapped JSON"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai:
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=valid_json_response_markdown), finish_reason="stop")]
-        mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
+@pytest.fixture
+def anthropic_no_retry_provider(_shared_anthropic_no_retry_provider):
+    """Anthropic provider for error-path tests that should not retry"""
+    yield from _restoring(_shared_anthropic_no_retry_provider)
 
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
 
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
+@pytest.fixture
+def openai_no_retry_provider(_shared_openai_no_retry_provider):
+    """OpenAI provider for error-path tests that should not retry"""
+    yield from _restoring(_shared_openai_no_retry_provider)
 
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h"
-        )
 
-        assert response.decision == "SELL"
-        assert response.confidence == 0.72
+@pytest.fixture(scope="module")
+def cached_prompt(_shared_anthropic_provider, sample_market_data):
+    """Prompt built once for signal tests that don't inspect prompt content"""
+    return _shared_anthropic_provider.build_prompt(sample_market_data, "BTC/USDT", "1h", 49500.0)
 
 
-@pytest.mark.asyncio
-async def test_openai_health_check_success(openai_config):
-    """Test OpenAI health check success"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai:
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="pong"))]
+@pytest.fixture
+def fast_sleep(monkeypatch):
+    """Replace retry backoff sleeps with a single loop tick; yields the requested delays"""
+    delays = []
+    real_sleep = asyncio.sleep
 
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
+    async def _no_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
 
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
+    # The providers call asyncio.sleep through the shared asyncio module
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+    return delays
 
-        result = await provider.health_check()
-        assert result is True
 
+@pytest.fixture(scope="module")
+def formatted_market_data(_shared_anthropic_provider, sample_market_data):
+    """sample_market_data formatted once, as it appears in every prompt"""
+    return _shared_anthropic_provider.format_market_data(sample_market_data)
 
-@pytest.mark.asyncio
-async def test_openai_health_check_failure(openai_config):
-    """Test OpenAI health check failure"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai:
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
-        mock_openai.return_value = mock_client
 
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
+# ==================== PROVIDER MATRIX ====================
 
-        result = await provider.health_check()
-        assert result is False
+def anthropic_resp(text, in_tok=500, out_tok=200):
+    """Anthropic Messages API response carrying ``text``"""
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(input_tokens=in_tok, output_tokens=out_tok),
+        stop_reason="end_turn",
+    )
 
 
-def test_openai_estimate_cost(openai_config):
-    """Test OpenAI cost estimation"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI'):
-        provider = OpenAIProvider(openai_config)
+def openai_resp(text, in_tok=500, out_tok=200):
+    """OpenAI chat completion carrying ``text``"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")],
+        usage=SimpleNamespace(
+            prompt_tokens=in_tok, completion_tokens=out_tok, total_tokens=in_tok + out_tok
+        ),
+    )
 
-        # Test with gpt-4-turbo pricing: $10/M input, $30/M output
-        cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
-        expected_cost = (1000 / 1_000_000 * 10.0) + (500 / 1_000_000 * 30.0)
-        assert abs(cost - expected_cost) < 0.0001
 
+def gemini_resp(text):
+    """Gemini generate_content response carrying ``text``"""
+    return SimpleNamespace(text=text, finish_reason="STOP")
 
-# ==================== GEMINI PROVIDER TESTS ====================
 
-@pytest.mark.asyncio
-async def test_gemini_generate_signal_success(gemini_config, sample_market_data, valid_json_response):
-    """Test successful signal generation with Gemini"""
-    with patch('llm_service.providers.gemini_provider.genai') as mock_genai:
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.text = json.dumps(valid_json_response)
-        mock_response.finish_reason = "STOP"
+# Grok is served through the OpenAI-compatible chat completions API
+grok_resp = openai_resp
 
-        mock_model = Mock()
-        mock_model.generate_content = Mock(return_value=mock_response)
 
-        mock_genai.configure = Mock()
-        mock_genai.GenerativeModel = Mock(return_value=mock_model)
+class _FakeEndpoint:
+    """SDK resource whose ``create`` coroutine returns (or raises) a canned result"""
 
-        provider = GeminiProvider(gemini_config)
+    def __init__(self, response):
+        self._response = response
 
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h",
-            current_price=49500.0
-        )
+    async def create(self, **kwargs):
+        if isinstance(self._response, Exception):
+            raise self._response
+        return self._response
 
-        assert isinstance(response, ProviderResponse)
-        assert response.provider_name == "gemini"
-        assert response.decision == "BUY"
-        assert response.confidence == 0.85
-        assert response.cost_usd > 0
 
+class _FakeAnthClient:
+    """Stand-in for AsyncAnthropic exposing ``messages.create``"""
 
-@pytest.mark.asyncio
-async def test_gemini_generate_signal_markdown_wrapped(gemini_config, sample_market_data, valid_json_response_markdown):
-    """Test Gemini parsing markdown-wrapped JSON"""
-    with patch('llm_service.providers.gemini_provider.genai') as mock_genai:
-        mock_response = Mock()
-        mock_response.text = valid_json_response_markdown
+    def __init__(self, response):
+        self.messages = _FakeEndpoint(response)
 
-        mock_model = Mock()
-        mock_model.generate_content = Mock(return_value=mock_response)
 
-        mock_genai.configure = Mock()
-        mock_genai.GenerativeModel = Mock(return_value=mock_model)
+class _FakeOpenAIClient:
+    """Stand-in for AsyncOpenAI exposing ``chat.completions.create`` (OpenAI and Grok)"""
 
-        provider = GeminiProvider(gemini_config)
+    def __init__(self, response):
+        self.chat = SimpleNamespace(completions=_FakeEndpoint(response))
 
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h"
-        )
 
-        assert response.decision == "SELL"
-        assert response.confidence == 0.72
+class _FakeGeminiModel:
+    """Stand-in for genai.GenerativeModel; ``generate_content`` is synchronous"""
 
+    def __init__(self, response):
+        self._response = response
 
-@pytest.mark.asyncio
-async def test_gemini_generate_signal_invalid_json(gemini_config, sample_market_data):
-    """Test Gemini handling invalid JSON response"""
-    with patch('llm_service.providers.gemini_provider.genai') as mock_genai:
-        mock_response = Mock()
-        mock_response.text = "Not valid JSON!"
+    def generate_content(self, *args, **kwargs):
+        if isinstance(self._response, Exception):
+            raise self._response
+        return self._response
 
-        mock_model = Mock()
-        mock_model.generate_content = Mock(return_value=mock_response)
 
-        mock_genai.configure = Mock()
-        mock_genai.GenerativeModel = Mock(return_value=mock_model)
+class ProviderSpec(NamedTuple):
+    """One row of the provider matrix"""
+    provider_cls: type
+    provider_fixture: str
+    no_retry_fixture: str  # Same provider with its retry loop disabled
+    build_response: Callable[[str], Any]
+    fake_client: type
+    client_attr: str  # Provider attribute holding the SDK client
 
-        provider = GeminiProvider(gemini_config)
 
-        with pytest.raises(ProviderError) as exc_info:
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
+PROVIDERS = [
+    ProviderSpec(AnthropicProvider, "anthropic_provider", "anthropic_no_retry_provider",
+                 anthropic_resp, _FakeAnthClient, "client"),
+    ProviderSpec(OpenAIProvider, "openai_provider", "openai_no_retry_provider",
+                 openai_resp, _FakeOpenAIClient, "client"),
+    # Gemini and Grok have no retry loop of their own
+    ProviderSpec(GeminiProvider, "gemini_provider", "gemini_provider",
+                 gemini_resp, _FakeGeminiModel, "model"),
+    ProviderSpec(GrokProvider, "grok_provider", "grok_provider",
+                 grok_resp, _FakeOpenAIClient, "client"),
+]
+PROVIDER_IDS = [spec.provider_cls.__name__ for spec in PROVIDERS]
 
-        assert "Failed to parse Gemini response as JSON" in str(exc_info.value)
 
+def install_fake(provider, spec, response):
+    """Swap the provider's SDK client for a fake that returns (or raises) ``response``"""
+    setattr(provider, spec.client_attr, spec.fake_client(response))
 
-@pytest.mark.asyncio
-async def test_gemini_health_check_success(gemini_config):
-    """Test Gemini health check success"""
-    with patch('llm_service.providers.gemini_provider.genai') as mock_genai:
-        mock_response = Mock()
-        mock_response.text = "pong"
 
-        mock_model = Mock()
-        mock_model.generate_content = Mock(return_value=mock_response)
-
-        mock_genai.configure = Mock()
-        mock_genai.GenerativeModel = Mock(return_value=mock_model)
-
-        provider = GeminiProvider(gemini_config)
-
-        result = await provider.health_check()
-        assert result is True
-
-
-@pytest.mark.asyncio
-async def test_gemini_health_check_failure(gemini_config):
-    """Test Gemini health check failure"""
-    with patch('llm_service.providers.gemini_provider.genai') as mock_genai:
-        mock_model = Mock()
-        mock_model.generate_content = Mock(side_effect=Exception("API Error"))
-
-        mock_genai.configure = Mock()
-        mock_genai.GenerativeModel = Mock(return_value=mock_model)
+@pytest.mark.parametrize("spec", PROVIDERS, ids=PROVIDER_IDS)
+@pytest.mark.parametrize(
+    "payload_fixture,decision,confidence",
+    [("valid_json_text", "BUY", 0.85), ("valid_json_response_markdown", "SELL", 0.72)],
+    ids=["json", "markdown"],
+)
+async def test_generate_signal_success(
+    spec, payload_fixture, decision, confidence, request, monkeypatch, sample_market_data, cached_prompt
+):
+    """Test successful signal generation, plain and markdown-wrapped, for every provider"""
+    provider = request.getfixturevalue(spec.provider_fixture)
+    payload = request.getfixturevalue(payload_fixture)
+
+    monkeypatch.setattr(provider, "build_prompt", lambda *args, **kwargs: cached_prompt)
+    install_fake(provider, spec, spec.build_response(payload))
+
+    response = await provider.generate_signal(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h",
+        current_price=49500.0
+    )
 
-        provider = GeminiProvider(gemini_config)
+    assert isinstance(response, ProviderResponse)
+    assert response.provider_name == provider.config.name
+    assert response.decision == decision
+    assert response.confidence == confidence
+    assert response.cost_usd > 0
+    assert response.latency_ms > 0
+    # Gemini estimates tokens from text length rather than reporting usage
+    if spec.provider_cls is not GeminiProvider:
+        assert response.tokens_used == 700
+    if payload_fixture == "valid_json_text":
+        assert response.reasoning == "Strong bullish indicators with RSI showing momentum"
+        assert response.risk_level == "medium"
+        assert response.suggested_stop_loss == 48000.0
+        assert response.suggested_take_profit == 51000.0
 
-        result = await provider.health_check()
-        assert result is False
 
+@pytest.mark.parametrize(
+    "provider_fixture,input_rate,output_rate",
+    [
+        ("anthropic_provider", 3.0, 15.0),  # claude-3-5-sonnet
+        ("openai_provider", 10.0, 30.0),  # gpt-4-turbo
+        ("gemini_provider", 3.5, 10.5),  # gemini-1.5-pro
+        ("grok_provider", 5.0, 15.0),  # grok-beta
+    ],
+    ids=PROVIDER_IDS,
+)
+def test_estimate_cost(provider_fixture, input_rate, output_rate, request):
+    """Test cost estimation against each provider's per-million-token pricing"""
+    provider = request.getfixturevalue(provider_fixture)
+
+    cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
+    expected_cost = (1000 / 1_000_000 * input_rate) + (500 / 1_000_000 * output_rate)
+    assert math.isclose(cost, expected_cost, abs_tol=1e-4)
+
+
+# (prompt_tokens, completion_tokens) pairs checked against every model's pricing
+_PRICING_PROMPT_TOKENS = np.array([1, 1_000, 12_345, 250_000])
+_PRICING_COMPLETION_TOKENS = np.array([1, 500, 2_048, 8_000])
+
+
+@pytest.mark.parametrize("spec", PROVIDERS, ids=PROVIDER_IDS)
+def test_estimate_cost_pricing_table(spec):
+    """Test estimate_cost for every model in each provider's PRICING table"""
+    name = spec.provider_fixture.removesuffix("_provider")
+    pricing = spec.provider_cls.PRICING
+    models = list(pricing)
+    rates_in = np.array([pricing[m]["input"] for m in models])[:, None]
+    rates_out = np.array([pricing[m]["output"] for m in models])[:, None]
+
+    # One row per model, one column per token pair
+    expected = (_PRICING_PROMPT_TOKENS * rates_in + _PRICING_COMPLETION_TOKENS * rates_out) / 1e6
+    actual = np.array([
+        [
+            provider.estimate_cost(int(p), int(c))
+            for p, c in zip(_PRICING_PROMPT_TOKENS, _PRICING_COMPLETION_TOKENS)
+        ]
+        for provider in (spec.provider_cls(make_config(name, model=m)) for m in models)
+    ])
 
-def test_gemini_estimate_cost(gemini_config):
-    """Test Gemini cost estimation"""
-    with patch('llm_service.providers.gemini_provider.genai'):
-        provider = GeminiProvider(gemini_config)
+    # Anthropic rounds to 6 decimal places
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-6)
 
-        # Test with gemini-1.5-pro pricing: $3.5/M input, $10.5/M output
-        cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
-        expected_cost = (1000 / 1_000_000 * 3.5) + (500 / 1_000_000 * 10.5)
-        assert abs(cost - expected_cost) < 0.0001
 
+@pytest.mark.parametrize("spec", PROVIDERS, ids=PROVIDER_IDS)
+@pytest.mark.parametrize(
+    "ok", [True, pytest.param(False, marks=pytest.mark.slow)], ids=["success", "failure"]
+)
+async def test_health_check(spec, ok, request):
+    """Test health check success and failure for every provider"""
+    provider = request.getfixturevalue(spec.provider_fixture)
+    install_fake(provider, spec, spec.build_response("pong") if ok else Exception("API Error"))
 
-# ==================== GROK PROVIDER TESTS ====================
+    result = await provider.health_check()
+    assert result is ok
 
-@pytest.mark.asyncio
-async def test_grok_generate_signal_success(grok_config, sample_market_data, valid_json_response):
-    """Test successful signal generation with Grok"""
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI') as mock_openai:
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=json.dumps(valid_json_response)), finish_reason="stop")]
-        mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
 
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
+# ==================== ANTHROPIC PROVIDER TESTS ====================
 
-        provider = GrokProvider(grok_config)
-        provider.client = mock_client
+@pytest.mark.slow
+async def test_anthropic_generate_signal_invalid_json(anthropic_no_retry_provider, sample_market_data):
+    """Test Anthropic handling invalid JSON response"""
+    anthropic_no_retry_provider.client = _FakeAnthClient(anthropic_resp("This is not JSON at all!"))
 
-        response = await provider.generate_signal(
+    with pytest.raises(ProviderError) as exc_info:
+        await anthropic_no_retry_provider.generate_signal(
             market_data=sample_market_data,
             pair="BTC/USDT",
-            timeframe="1h",
-            current_price=49500.0
+            timeframe="1h"
         )
 
-        assert isinstance(response, ProviderResponse)
-        assert response.provider_name == "grok"
-        assert response.decision == "BUY"
-        assert response.confidence == 0.85
-        assert response.tokens_used == 700
-        assert response.cost_usd > 0
-
-
-@pytest.mark.asyncio
-async def test_grok_generate_signal_markdown_wrapped(grok_config, sample_market_data, valid_json_response_markdown):
-    """Test Grok parsing markdown-wrapped JSON"""
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI') as mock_openai:
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=valid_json_response_markdown), finish_reason="stop")]
-        mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
+    # Error message includes retry logic information
+    assert "Could not extract valid JSON" in str(exc_info.value)
 
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
 
-        provider = GrokProvider(grok_config)
-        provider.client = mock_client
+@pytest.mark.slow
+async def test_anthropic_generate_signal_missing_fields(anthropic_no_retry_provider, sample_market_data):
+    """Test Anthropic handling response with missing required fields"""
+    anthropic_no_retry_provider.client = _FakeAnthClient(anthropic_resp(_INCOMPLETE_TEXT))
 
-        response = await provider.generate_signal(
+    with pytest.raises(ProviderError):
+        await anthropic_no_retry_provider.generate_signal(
             market_data=sample_market_data,
             pair="BTC/USDT",
             timeframe="1h"
         )
 
-        assert response.decision == "SELL"
-        assert response.confidence == 0.72
-
-
-@pytest.mark.asyncio
-async def test_grok_health_check_success(grok_config):
-    """Test Grok health check success"""
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI') as mock_openai:
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="pong"))]
-
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
-
-        provider = GrokProvider(grok_config)
-        provider.client = mock_client
 
-        result = await provider.health_check()
-        assert result is True
-
-
-@pytest.mark.asyncio
-async def test_grok_health_check_failure(grok_config):
-    """Test Grok health check failure"""
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI') as mock_openai:
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
-        mock_openai.return_value = mock_client
-
-        provider = GrokProvider(grok_config)
-        provider.client = mock_client
-
-        result = await provider.health_check()
-        assert result is False
+# ==================== GEMINI PROVIDER TESTS ====================
 
+@pytest.mark.slow
+async def test_gemini_generate_signal_invalid_json(gemini_provider, sample_market_data):
+    """Test Gemini handling invalid JSON response"""
+    gemini_provider.model = _FakeGeminiModel(gemini_resp("Not valid JSON!"))
 
-def test_grok_estimate_cost(grok_config):
-    """Test Grok cost estimation"""
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI'):
-        provider = GrokProvider(grok_config)
+    with pytest.raises(ProviderError) as exc_info:
+        await gemini_provider.generate_signal(
+            market_data=sample_market_data,
+            pair="BTC/USDT",
+            timeframe="1h"
+        )
 
-        # Test with grok-beta pricing: $5/M input, $15/M output
-        cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
-        expected_cost = (1000 / 1_000_000 * 5.0) + (500 / 1_000_000 * 15.0)
-        assert abs(cost - expected_cost) < 0.0001
+    assert "Failed to parse Gemini response as JSON" in str(exc_info.value)
 
 
 # ==================== EDGE CASE TESTS ====================
 
-@pytest.mark.asyncio
-async def test_all_providers_invalid_decision(anthropic_config, sample_market_data):
-    """Test all providers reject invalid decision values"""
-    invalid_response = {
-        "decision": "MAYBE",  # Invalid decision
-        "confidence": 0.5,
-        "reasoning": "Not sure"
-    }
-
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_response = Mock()
-        mock_response.content = [Mock(text=json.dumps(invalid_response))]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
-
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
-
-        with pytest.raises(ProviderError) as exc_info:
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
-
-        assert "Invalid decision" in str(exc_info.value)
-
-
-@pytest.mark.asyncio
-async def test_all_providers_invalid_confidence(anthropic_config, sample_market_data):
-    """Test all providers reject invalid confidence values"""
-    invalid_response = {
-        "decision": "BUY",
-        "confidence": 1.5,  # Invalid confidence (> 1.0)
-        "reasoning": "Very confident!"
-    }
-
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_response = Mock()
-        mock_response.content = [Mock(text=json.dumps(invalid_response))]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
-
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
-
-        with pytest.raises(ProviderError) as exc_info:
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
+@pytest.mark.slow
+@pytest.mark.parametrize("spec", PROVIDERS, ids=PROVIDER_IDS)
+@pytest.mark.parametrize(
+    "bad_text,msg",
+    [(_INVALID_DECISION_TEXT, "Invalid decision"), (_INVALID_CONFIDENCE_TEXT, "Invalid confidence")],
+    ids=["decision", "confidence"],
+)
+async def test_validation_rejects(spec, bad_text, msg, request, monkeypatch, sample_market_data, cached_prompt):
+    """Test all providers reject invalid decision and confidence values"""
+    provider = request.getfixturevalue(spec.no_retry_fixture)
+    monkeypatch.setattr(provider, "build_prompt", lambda *args, **kwargs: cached_prompt)
+    install_fake(provider, spec, spec.build_response(bad_text))
+
+    with pytest.raises(ProviderError) as exc_info:
+        await provider.generate_signal(
+            market_data=sample_market_data,
+            pair="BTC/USDT",
+            timeframe="1h"
+        )
 
-        assert "Invalid confidence" in str(exc_info.value)
+    assert msg in str(exc_info.value)
 
 
 # ==================== BASE PROVIDER TESTS ====================
@@ -726,93 +593,89 @@ def test_provider_config_validation():
         )
 
 
-def test_provider_status_tracking(anthropic_config):
+def test_provider_status_tracking(anthropic_provider):
     """Test provider status and metrics tracking"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
+    provider = anthropic_provider
 
-        # Initial status
-        assert provider.status == ProviderStatus.ACTIVE
-        assert provider._request_count == 0
-        assert provider._error_count == 0
+    # Initial status
+    assert provider.status == ProviderStatus.ACTIVE
+    assert provider._request_count == 0
+    assert provider._error_count == 0
 
-        # Update metrics without error
-        provider.update_metrics(latency_ms=150.0)
-        assert provider._request_count == 1
-        assert provider._error_count == 0
+    # Update metrics without error
+    provider.update_metrics(latency_ms=150.0)
+    assert provider._request_count == 1
+    assert provider._error_count == 0
 
-        # Update metrics with error
-        error = Exception("Test error")
-        provider.update_metrics(latency_ms=0, error=error)
-        assert provider._request_count == 2
-        assert provider._error_count == 1
-        assert provider._last_error == error
+    # Update metrics with error
+    error = Exception("Test error")
+    provider.update_metrics(latency_ms=0, error=error)
+    assert provider._request_count == 2
+    assert provider._error_count == 1
+    assert provider._last_error == error
 
 
-def test_provider_get_status(anthropic_config):
+def test_provider_get_status(anthropic_provider):
     """Test provider status reporting"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
+    provider = anthropic_provider
 
-        # Add some metrics
-        provider.update_metrics(100.0)
-        provider.update_metrics(200.0)
+    # Add some metrics
+    provider.update_metrics(100.0)
+    provider.update_metrics(200.0)
 
-        status = provider.get_status()
+    status = provider.get_status()
 
-        assert status["name"] == "anthropic"
-        assert status["model"] == "claude-3-5-sonnet-20241022"
-        assert status["status"] == "active"
-        assert status["enabled"] is True
-        assert status["weight"] == 1.0
-        assert status["requests"] == 2
-        assert status["errors"] == 0
-        assert status["error_rate"] == 0.0
-        assert status["avg_latency_ms"] == 150.0
+    assert status["name"] == "anthropic"
+    assert status["model"] == "claude-3-5-sonnet-20241022"
+    assert status["status"] == "active"
+    assert status["enabled"] is True
+    assert status["weight"] == 1.0
+    assert status["requests"] == 2
+    assert status["errors"] == 0
+    assert status["error_rate"] == 0.0
+    assert status["avg_latency_ms"] == 150.0
 
 
-def test_provider_is_available(anthropic_config):
+def test_provider_is_available(anthropic_provider):
     """Test provider availability check"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
+    provider = anthropic_provider
+    config = provider.config
 
-        # Available by default
-        assert provider.is_available() is True
+    # Available by default
+    assert provider.is_available() is True
 
-        # Unavailable when disabled
-        provider.config.enabled = False
-        assert provider.is_available() is False
+    # Unavailable when disabled
+    provider.config = replace(config, enabled=False)
+    assert provider.is_available() is False
 
-        # Unavailable when status is UNAVAILABLE
-        provider.config.enabled = True
-        provider.set_status(ProviderStatus.UNAVAILABLE)
-        assert provider.is_available() is False
+    # Unavailable when status is UNAVAILABLE
+    provider.config = config
+    provider.set_status(ProviderStatus.UNAVAILABLE)
+    assert provider.is_available() is False
 
-        # Unavailable when circuit is open
-        provider.set_status(ProviderStatus.CIRCUIT_OPEN)
-        assert provider.is_available() is False
+    # Unavailable when circuit is open
+    provider.set_status(ProviderStatus.CIRCUIT_OPEN)
+    assert provider.is_available() is False
 
 
-def test_provider_build_prompt(anthropic_config, sample_market_data):
+def test_provider_build_prompt(anthropic_provider, sample_market_data, formatted_market_data):
     """Test prompt building"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
-
-        prompt = provider.build_prompt(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h",
-            current_price=49500.0
-        )
+    prompt = anthropic_provider.build_prompt(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h",
+        current_price=49500.0
+    )
 
-        assert "BTC/USDT" in prompt
-        assert "1h" in prompt
-        assert "49500.0" in prompt
-        assert "rsi" in prompt.lower()
-        assert "macd" in prompt.lower()
-        assert "BUY" in prompt
-        assert "SELL" in prompt
-        assert "HOLD" in prompt
+    assert "BTC/USDT" in prompt
+    assert "1h" in prompt
+    assert "49500.0" in prompt
+    assert formatted_market_data in prompt
+    assert "rsi" in prompt.lower()
+    assert "macd" in prompt.lower()
+    assert "BUY" in prompt
+    assert "SELL" in prompt
+    assert "HOLD" in prompt
 
 
 def test_provider_response_to_dict():
@@ -845,293 +708,334 @@ def test_provider_response_to_dict():
 
 # ==================== ERROR SCENARIO TESTS ====================
 
-@pytest.mark.asyncio
-async def test_anthropic_api_timeout(anthropic_config, sample_market_data):
+@pytest.mark.slow
+async def test_anthropic_api_timeout(sample_market_data):
     """Test handling of API timeout"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(side_effect=asyncio.TimeoutError("Request timeout"))
-        mock_anthropic.return_value = mock_client
+    async def _boom(**kwargs):
+        raise asyncio.TimeoutError("Request timeout")
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
+    mock_client = SimpleNamespace(messages=SimpleNamespace(create=_boom))
 
-        with pytest.raises(ProviderError):
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
+    provider = AnthropicProvider(make_config("anthropic", max_retries=1))
+    provider.client = mock_client
+
+    with pytest.raises(ProviderError):
+        await provider.generate_signal(
+            market_data=sample_market_data,
+            pair="BTC/USDT",
+            timeframe="1h"
+        )
 
-        # Check error tracking
-        assert provider._error_count == 1
+    # Check error tracking
+    assert provider._error_count == 1
 
 
-@pytest.mark.asyncio
-async def test_multiple_json_code_blocks(anthropic_config, sample_market_data):
+async def test_multiple_json_code_blocks(anthropic_provider, sample_market_data):
     """Test handling response with multiple JSON code blocks (takes first one)"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
-        response_with_multiple_blocks = """
-Here's my analysis:
+    anthropic_provider.client = _FakeAnthClient(anthropic_resp(_MULTI_BLOCK_TEXT))
 
-```json
-{
-    "decision": "BUY",
-    "confidence": 0.9,
-    "reasoning": "Strong buy signal"
-}
-```
+    response = await anthropic_provider.generate_signal(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h"
+    )
 
-And here's another analysis:
+    # Should parse the first JSON block
+    assert response.decision == "BUY"
+    assert response.confidence == 0.9
 
-```json
-{
-    "decision": "SELL",
-    "confidence": 0.1,
-    "reasoning": "Ignore this"
-}
-```
-"""
 
-        mock_response = Mock()
-        mock_response.content = [Mock(text=response_with_multiple_blocks)]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-        mock_response.stop_reason = "end_turn"
+# ==================== PERFORMANCE TESTS ====================
 
-        mock_client = AsyncMock()
-        mock_client.messages.create = AsyncMock(return_value=mock_response)
-        mock_anthropic.return_value = mock_client
+def test_extract_json_from_large_response(anthropic_provider):
+    """Test JSON block extraction on a ~100KB response"""
+    padding = "Market commentary line.\n" * 4000
+    text = f"{padding}```json\n{VALID_JSON_TEXT}\n```\n{padding}"
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
+    assert anthropic_provider._extract_json(text) == VALID_JSON_TEXT
 
-        response = await provider.generate_signal(
-            market_data=sample_market_data,
-            pair="BTC/USDT",
-            timeframe="1h"
-        )
 
-        # Should parse the first JSON block
-        assert response.decision == "BUY"
-        assert response.confidence == 0.9
+async def test_concurrent_provider_calls(anthropic_provider, openai_provider, sample_market_data, valid_json_text):
+    """Test multiple providers can be called concurrently"""
+    anthropic_provider.client = _FakeAnthClient(anthropic_resp(valid_json_text))
+    openai_provider.client = _FakeOpenAIClient(openai_resp(valid_json_text))
+
+    # Call both concurrently
+    responses = await asyncio.gather(
+        anthropic_provider.generate_signal(sample_market_data, "BTC/USDT", "1h"),
+        openai_provider.generate_signal(sample_market_data, "BTC/USDT", "1h"),
+    )
 
+    assert len(responses) == 2
+    assert responses[0].provider_name == "anthropic"
+    assert responses[1].provider_name == "openai"
+    assert all(r.decision == "BUY" for r in responses)
 
-# ==================== PERFORMANCE TESTS ====================
 
-@pytest.mark.asyncio
-async def test_concurrent_provider_calls(anthropic_config, openai_config, sample_market_data, valid_json_response):
-    """Test multiple providers can be called concurrently"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic, \
-         patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai:
-
-        # Mock Anthropic
-        anthropic_mock_response = Mock()
-        anthropic_mock_response.content = [Mock(text=json.dumps(valid_json_response))]
-        anthropic_mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-        anthropic_mock_response.stop_reason = "end_turn"
-
-        anthropic_mock_client = AsyncMock()
-        anthropic_mock_client.messages.create = AsyncMock(return_value=anthropic_mock_response)
-        mock_anthropic.return_value = anthropic_mock_client
-
-        # Mock OpenAI
-        openai_mock_response = Mock()
-        openai_mock_response.choices = [Mock(message=Mock(content=json.dumps(valid_json_response)), finish_reason="stop")]
-        openai_mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
-
-        openai_mock_client = AsyncMock()
-        openai_mock_client.chat.completions.create = AsyncMock(return_value=openai_mock_response)
-        mock_openai.return_value = openai_mock_client
-
-        # Create providers
-        anthropic_provider = AnthropicProvider(anthropic_config)
-        anthropic_provider.client = anthropic_mock_client
-
-        openai_provider = OpenAIProvider(openai_config)
-        openai_provider.client = openai_mock_client
-
-        # Call both concurrently
-        responses = await asyncio.gather(
-            anthropic_provider.generate_signal(sample_market_data, "BTC/USDT", "1h"),
-            openai_provider.generate_signal(sample_market_data, "BTC/USDT", "1h"),
-        )
+async def test_provider_respects_concurrency_limit(sample_market_data, cached_prompt, monkeypatch):
+    """Test a provider never has more than max_concurrency API calls in flight"""
+    limit = 3
+    provider = GrokProvider(make_config("grok", max_concurrency=limit))
+    monkeypatch.setattr(provider, "build_prompt", lambda *args, **kwargs: cached_prompt)
+
+    in_flight = peak = 0
+    release = asyncio.Event()
 
-        assert len(responses) == 2
-        assert responses[0].provider_name == "anthropic"
-        assert responses[1].provider_name == "openai"
-        assert all(r.decision == "BUY" for r in responses)
+    async def create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await release.wait()
+        in_flight -= 1
+        return grok_resp(VALID_JSON_TEXT)
+
+    provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    tasks = [
+        asyncio.create_task(provider.generate_signal(sample_market_data, "BTC/USDT", "1h"))
+        for _ in range(100)
+    ]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert in_flight == limit
+
+    release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert peak == limit
+    assert all(r.decision == "BUY" for r in responses)
+
+
+def test_request_slot_is_per_event_loop():
+    """Test each event loop gets its own request semaphore"""
+    provider = GrokProvider(make_config("grok", max_concurrency=2))
+
+    async def slot():
+        return provider._request_slot(), provider._request_slot()
+
+    def run_on_new_loop():
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(slot())
+        finally:
+            loop.close()
+
+    first, again = run_on_new_loop()
+    second, _ = run_on_new_loop()
+
+    assert first is again
+    assert first is not second
 
 
 # ==================== RETRY LOGIC TESTS ====================
 
-@pytest.mark.asyncio
-async def test_anthropic_retry_on_rate_limit(anthropic_config, sample_market_data, valid_json_response):
+async def test_anthropic_retry_on_rate_limit(anthropic_provider, sample_market_data, valid_json_text, fast_sleep):
     """Test retry logic when rate limited"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic, \
-         patch('llm_service.providers.anthropic_provider.asyncio.sleep') as mock_sleep:
-
-        # First call fails with rate limit, second succeeds
-        mock_response = Mock()
-        mock_response.content = [Mock(text=json.dumps(valid_json_response))]
-        mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-        mock_response.stop_reason = "end_turn"
-
-        mock_client = AsyncMock()
-        # Fail first time with ProviderRateLimitError, succeed second time
-        mock_client.messages.create = AsyncMock(
-            side_effect=[
-                ProviderRateLimitError("anthropic", "Rate limit exceeded"),
-                mock_response
-            ]
-        )
-        mock_anthropic.return_value = mock_client
+    # Fail first time with ProviderRateLimitError, succeed second time
+    mock_create = AsyncMock(
+        side_effect=[
+            ProviderRateLimitError("anthropic", "Rate limit exceeded"),
+            anthropic_resp(valid_json_text)
+        ]
+    )
+    anthropic_provider.client = SimpleNamespace(messages=SimpleNamespace(create=mock_create))
+
+    response = await anthropic_provider.generate_signal(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h"
+    )
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
+    # Should succeed after retry
+    assert response.decision == "BUY"
+    # Sleep should have been called for backoff
+    assert len(fast_sleep) >= 1
 
-        response = await provider.generate_signal(
+
+async def test_anthropic_authentication_error_no_retry(anthropic_provider, sample_market_data):
+    """Test that authentication errors don't retry"""
+    # Always fail with auth error
+    mock_create = AsyncMock(
+        side_effect=ProviderAuthenticationError("anthropic", "Invalid API key")
+    )
+    provider = anthropic_provider
+    provider.client = SimpleNamespace(messages=SimpleNamespace(create=mock_create))
+
+    with pytest.raises(ProviderAuthenticationError):
+        await provider.generate_signal(
             market_data=sample_market_data,
             pair="BTC/USDT",
             timeframe="1h"
         )
 
-        # Should succeed after retry
-        assert response.decision == "BUY"
-        # Sleep should have been called for backoff
-        assert mock_sleep.call_count >= 1
+    # Should only call once (no retries on auth error)
+    assert mock_create.call_count == 1
+    # Status should be set to UNAVAILABLE
+    assert provider.status == ProviderStatus.UNAVAILABLE
 
 
-@pytest.mark.asyncio
-async def test_anthropic_authentication_error_no_retry(anthropic_config, sample_market_data):
-    """Test that authentication errors don't retry"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
+async def test_health_check_with_timeout(anthropic_provider):
+    """Test health check timeout handling"""
+    with patch('llm_service.providers.anthropic_provider.asyncio.wait_for') as mock_wait_for:
 
-        mock_client = AsyncMock()
-        # Always fail with auth error
-        mock_client.messages.create = AsyncMock(
-            side_effect=ProviderAuthenticationError("anthropic", "Invalid API key")
-        )
-        mock_anthropic.return_value = mock_client
+        mock_wait_for.side_effect = asyncio.TimeoutError()
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
+        provider = anthropic_provider
+        provider.client = _FakeAnthClient(None)
 
-        with pytest.raises(ProviderAuthenticationError):
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
+        result = await provider.health_check()
 
-        # Should only call once (no retries on auth error)
-        assert mock_client.messages.create.call_count == 1
-        # Status should be set to UNAVAILABLE
-        assert provider.status == ProviderStatus.UNAVAILABLE
+        assert result is False
+        assert provider.status == ProviderStatus.DEGRADED
 
 
-@pytest.mark.asyncio
-async def test_health_check_with_timeout(anthropic_config):
-    """Test health check timeout handling"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic, \
-         patch('llm_service.providers.anthropic_provider.asyncio.wait_for') as mock_wait_for:
+# ==================== BATCH API TESTS ====================
+
+def _batch_client(status, output_lines=()):
+    """OpenAI client stub whose batch goes in_progress -> ``status`` with the given output JSONL"""
+    return SimpleNamespace(
+        files=SimpleNamespace(
+            create=AsyncMock(return_value=SimpleNamespace(id="file-in")),
+            content=AsyncMock(return_value=SimpleNamespace(text="\n".join(output_lines))),
+        ),
+        batches=SimpleNamespace(
+            create=AsyncMock(return_value=SimpleNamespace(
+                id="batch-1", status="in_progress", output_file_id=None
+            )),
+            retrieve=AsyncMock(return_value=SimpleNamespace(
+                id="batch-1", status=status, output_file_id="file-out" if status == "completed" else None
+            )),
+        ),
+    )
 
-        mock_wait_for.side_effect = asyncio.TimeoutError()
 
-        mock_client = AsyncMock()
-        mock_anthropic.return_value = mock_client
+def _batch_result(index, text):
+    """One line of a Batch API output file carrying a chat completion with ``text``"""
+    return json.dumps({
+        "custom_id": str(index),
+        "response": {
+            "status_code": 200,
+            "body": {
+                "choices": [{"message": {"content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 500, "completion_tokens": 200, "total_tokens": 700},
+            },
+        },
+        "error": None,
+    })
+
+
+async def test_openai_batch_generate_signal(openai_provider, sample_market_data, monkeypatch):
+    """Test batch signal generation uploads JSONL, polls the batch and returns results in order"""
+    decisions = list(_DECISION_TEXTS)
+    # Results come back out of order and are matched on custom_id
+    output = [_batch_result(i, _DECISION_TEXTS[d]) for i, d in reversed(list(enumerate(decisions)))]
+    client = _batch_client("completed", output)
+    monkeypatch.setattr(openai_provider, "client", client)
+
+    items = [
+        {"market_data": sample_market_data, "pair": pair, "timeframe": "1h"}
+        for pair in ("BTC/USDT", "ETH/USDT", "SOL/USDT")
+    ]
+    responses = await openai_provider.generate_signal_batch(items, poll_interval=0)
+
+    assert [r.decision for r in responses] == decisions
+    sync_cost = openai_provider.estimate_cost(500, 200)
+    assert all(math.isclose(r.cost_usd, sync_cost * 0.5) for r in responses)
+    assert all(r.metadata["batch_id"] == "batch-1" for r in responses)
+
+    upload = client.files.create.call_args.kwargs
+    assert upload["purpose"] == "batch"
+    assert len(upload["file"][1].decode().splitlines()) == 3
+    client.batches.create.assert_awaited_once_with(
+        input_file_id="file-in", endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    client.batches.retrieve.assert_awaited_once_with("batch-1")
+    client.files.content.assert_awaited_once_with("file-out")
 
-        provider = AnthropicProvider(anthropic_config)
-        provider.client = mock_client
 
-        result = await provider.health_check()
+async def test_openai_batch_generate_signal_failed_batch(openai_provider, sample_market_data, monkeypatch):
+    """Test batch signal generation raises when the batch does not complete"""
+    monkeypatch.setattr(openai_provider, "client", _batch_client("expired"))
 
-        assert result is False
-        assert provider.status == ProviderStatus.DEGRADED
+    with pytest.raises(ProviderError) as exc_info:
+        await openai_provider.generate_signal_batch(
+            [{"market_data": sample_market_data, "pair": "BTC/USDT", "timeframe": "1h"}],
+            poll_interval=0,
+        )
 
+    assert "expired" in str(exc_info.value)
 
-# ==================== ADDITIONAL PROVIDER TESTS ====================
 
-def test_openai_different_model_pricing(openai_config):
-    """Test OpenAI pricing for different models"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI'):
-        # Test GPT-4o pricing
-        openai_config.model = "gpt-4o"
-        provider = OpenAIProvider(openai_config)
+async def test_openai_batch_generate_signal_max_wait(openai_provider, sample_market_data, monkeypatch):
+    """Test batch signal generation stops polling after max_wait"""
+    client = _batch_client("in_progress")
+    monkeypatch.setattr(openai_provider, "client", client)
 
-        cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
-        expected_cost = (1000 / 1_000_000 * 5.0) + (500 / 1_000_000 * 15.0)
-        assert abs(cost - expected_cost) < 0.0001
+    with pytest.raises(ProviderTimeoutError) as exc_info:
+        await openai_provider.generate_signal_batch(
+            [{"market_data": sample_market_data, "pair": "BTC/USDT", "timeframe": "1h"}],
+            poll_interval=0.01,
+            max_wait=0.05,
+        )
 
+    assert "in_progress" in str(exc_info.value)
+    client.files.content.assert_not_awaited()
 
-def test_gemini_token_estimation(gemini_config):
-    """Test Gemini token estimation"""
-    with patch('llm_service.providers.gemini_provider.genai'):
-        provider = GeminiProvider(gemini_config)
 
-        # Test token estimation
-        test_text = "This is a test message with some words"
-        tokens = provider._estimate_tokens(test_text)
+# ==================== ADDITIONAL PROVIDER TESTS ====================
 
-        # Should be roughly len / 4
-        assert tokens == len(test_text) // 4
+def test_openai_different_model_pricing():
+    """Test OpenAI pricing for different models"""
+    # Test GPT-4o pricing
+    provider = OpenAIProvider(make_config("openai", model="gpt-4o"))
 
+    cost = provider.estimate_cost(prompt_tokens=1000, completion_tokens=500)
+    assert math.isclose(cost, GPT4O_1K_500_COST, abs_tol=1e-4)
 
-@pytest.mark.asyncio
-async def test_all_decisions_valid(anthropic_config, sample_market_data):
-    """Test all valid decision types (BUY, SELL, HOLD)"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic') as mock_anthropic:
 
-        for decision in ["BUY", "SELL", "HOLD"]:
-            response_data = {
-                "decision": decision,
-                "confidence": 0.75,
-                "reasoning": f"Testing {decision} decision"
-            }
+def test_gemini_token_estimation(gemini_provider):
+    """Test Gemini token estimation"""
+    # Test token estimation
+    test_text = "This is a test message with some words"
+    tokens = gemini_provider._estimate_tokens(test_text)
 
-            mock_response = Mock()
-            mock_response.content = [Mock(text=json.dumps(response_data))]
-            mock_response.usage = Mock(input_tokens=500, output_tokens=200)
-            mock_response.stop_reason = "end_turn"
+    # Should be roughly len / 4
+    assert tokens == len(test_text) // 4
 
-            mock_client = AsyncMock()
-            mock_client.messages.create = AsyncMock(return_value=mock_response)
-            mock_anthropic.return_value = mock_client
 
-            provider = AnthropicProvider(anthropic_config)
-            provider.client = mock_client
+@pytest.mark.parametrize("decision", list(_DECISION_TEXTS))
+async def test_all_decisions_valid(decision, anthropic_provider, sample_market_data):
+    """Test all valid decision types (BUY, SELL, HOLD)"""
+    anthropic_provider.client = _FakeAnthClient(anthropic_resp(_DECISION_TEXTS[decision]))
 
-            response = await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
+    response = await anthropic_provider.generate_signal(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h"
+    )
 
-            assert response.decision == decision
+    assert response.decision == decision
 
 
-def test_provider_format_market_data(anthropic_config):
+def test_provider_format_market_data(anthropic_provider):
     """Test market data formatting"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
-
-        market_data = {
-            "rsi": 65.123456,
-            "macd": 0.05,
-            "volume": 1500000,
-            "recent_candles": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],  # Long list
-        }
+    market_data = {
+        "rsi": 65.123456,
+        "macd": 0.05,
+        "volume": 1500000,
+        "recent_candles": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],  # Long list
+    }
 
-        formatted = provider.format_market_data(market_data)
+    formatted = anthropic_provider.format_market_data(market_data)
 
-        # Should format floats to 4 decimals
-        assert "65.1235" in formatted
-        # Should truncate long lists
-        assert "showing first 5" in formatted
-        assert "rsi" in formatted
+    # Should format floats to 4 decimals
+    assert "65.1235" in formatted
+    # Should truncate long lists
+    assert "showing first 5" in formatted
+    assert "rsi" in formatted
 
 
-@pytest.mark.asyncio
-async def test_provider_error_with_original_exception():
+def test_provider_error_with_original_exception():
     """Test ProviderError stores original exception"""
     original_error = ValueError("Original error message")
     provider_error = ProviderError(
@@ -1142,211 +1046,162 @@ async def test_provider_error_with_original_exception():
 
     assert provider_error.provider_name == "test_provider"
     assert provider_error.original_error == original_error
-    assert "test_provider" in str(provider_error)
-    assert "Wrapped error message" in str(provider_error)
+    assert _PROVIDER_ERR_RE.search(str(provider_error))
 
 
-@pytest.mark.asyncio
-async def test_grok_with_custom_base_url(grok_config):
+def test_grok_with_custom_base_url(patched_sdks):
     """Test Grok provider with custom base URL"""
     custom_url = "https://custom.api.endpoint/v1"
-    grok_config.base_url = custom_url
+    patched_sdks.grok.reset_mock()
 
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI') as mock_openai:
-        provider = GrokProvider(grok_config)
+    config = make_config("grok", base_url=custom_url)
+    GrokProvider(config)
 
-        # Verify custom URL was used
-        mock_openai.assert_called_once()
-        call_kwargs = mock_openai.call_args.kwargs
-        assert call_kwargs['base_url'] == custom_url
+    # Verify custom URL was used
+    patched_sdks.grok.assert_called_once_with(
+        api_key=config.api_key,
+        base_url=custom_url,
+        timeout=config.timeout,
+        max_retries=config.max_retries,
+    )
 
 
-@pytest.mark.asyncio
-async def test_openai_with_no_usage_data(openai_config, sample_market_data):
+@pytest.mark.slow
+async def test_openai_with_no_usage_data(openai_no_retry_provider, sample_market_data):
     """Test OpenAI handling response without usage data"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai:
-        valid_response = {
-            "decision": "BUY",
-            "confidence": 0.8,
-            "reasoning": "Test"
-        }
-
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=json.dumps(valid_response)), finish_reason="stop")]
-        # No usage data
-        mock_response.usage = None
-
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
-
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
-
-        with pytest.raises(ProviderError):
-            # Should fail because we try to access usage.total_tokens
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
-
-
-def test_provider_set_status_logging(anthropic_config):
-    """Test that status changes are logged"""
-    with patch('llm_service.providers.anthropic_provider.AsyncAnthropic'):
-        provider = AnthropicProvider(anthropic_config)
-
-        # Change status
-        original_status = provider.status
-        provider.set_status(ProviderStatus.DEGRADED)
-
-        assert provider.status == ProviderStatus.DEGRADED
-        assert provider.status != original_status
-
-        # Setting same status again shouldn't log
-        provider.set_status(ProviderStatus.DEGRADED)
-        assert provider.status == ProviderStatus.DEGRADED
-
-
-# ==================== OPENAI RETRY & ERROR TESTS ====================
-
-@pytest.mark.asyncio
-async def test_openai_retry_on_timeout(openai_config, sample_market_data, valid_json_response):
-    """Test OpenAI retry logic on timeout"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai, \
-         patch('llm_service.providers.openai_provider.asyncio.wait_for') as mock_wait_for:
-
-        # First call times out, second succeeds
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=json.dumps(valid_json_response)), finish_reason="stop")]
-        mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
-
-        # First call fails, second succeeds
-        mock_wait_for.side_effect = [
-            asyncio.TimeoutError(),
-            mock_response
-        ]
+    mock_response = openai_resp(_NO_USAGE_TEXT)
+    mock_response.usage = None  # No usage data
+    openai_no_retry_provider.client = _FakeOpenAIClient(mock_response)
 
-        mock_client = AsyncMock()
-        mock_openai.return_value = mock_client
-
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
-
-        response = await provider.generate_signal(
+    with pytest.raises(ProviderError):
+        # Should fail because we try to access usage.total_tokens
+        await openai_no_retry_provider.generate_signal(
             market_data=sample_market_data,
             pair="BTC/USDT",
             timeframe="1h"
         )
 
-        # Should succeed after retry
-        assert response.decision == "BUY"
-        assert mock_wait_for.call_count == 2
-
 
-@pytest.mark.asyncio
-async def test_openai_max_retries_exceeded(openai_config, sample_market_data):
-    """Test OpenAI fails after max retries"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai, \
-         patch('llm_service.providers.openai_provider.asyncio.wait_for') as mock_wait_for:
+def test_provider_set_status_logging(anthropic_provider):
+    """Test that status changes are logged"""
+    provider = anthropic_provider
 
-        # Always timeout
-        mock_wait_for.side_effect = asyncio.TimeoutError()
+    # Change status
+    original_status = provider.status
+    provider.set_status(ProviderStatus.DEGRADED)
 
-        mock_client = AsyncMock()
-        mock_openai.return_value = mock_client
+    assert provider.status == ProviderStatus.DEGRADED
+    assert provider.status != original_status
 
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
+    # Setting same status again shouldn't log
+    provider.set_status(ProviderStatus.DEGRADED)
+    assert provider.status == ProviderStatus.DEGRADED
 
-        with pytest.raises(ProviderTimeoutError):
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
 
+# ==================== OPENAI RETRY & ERROR TESTS ====================
 
-@pytest.mark.asyncio
-async def test_openai_json_parsing_error(openai_config, sample_market_data):
-    """Test OpenAI handles JSON parsing errors"""
-    with patch('llm_service.providers.openai_provider.AsyncOpenAI') as mock_openai, \
-         patch('llm_service.providers.openai_provider.asyncio.wait_for') as mock_wait_for:
+async def test_openai_retry_on_timeout(openai_provider, sample_market_data, valid_json_text, fast_sleep):
+    """Test OpenAI retry logic on timeout"""
+    # First call times out, second succeeds
+    mock_create = AsyncMock(side_effect=[asyncio.TimeoutError(), openai_resp(valid_json_text)])
+    openai_provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=mock_create)))
+
+    response = await openai_provider.generate_signal(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h"
+    )
 
-        # Return invalid JSON
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Not valid JSON!"), finish_reason="stop")]
-        mock_response.usage = Mock(prompt_tokens=500, completion_tokens=200, total_tokens=700)
+    # Should succeed after retry
+    assert response.decision == "BUY"
+    assert mock_create.call_count == 2
 
-        mock_wait_for.return_value = mock_response
 
-        mock_client = AsyncMock()
-        mock_openai.return_value = mock_client
+async def test_openai_max_retries_exceeded(openai_provider, sample_market_data, fast_sleep):
+    """Test OpenAI fails after max retries"""
+    # Always timeout
+    openai_provider.client = _FakeOpenAIClient(asyncio.TimeoutError())
 
-        provider = OpenAIProvider(openai_config)
-        provider.client = mock_client
+    with pytest.raises(ProviderTimeoutError):
+        await openai_provider.generate_signal(
+            market_data=sample_market_data,
+            pair="BTC/USDT",
+            timeframe="1h"
+        )
 
-        with pytest.raises(ProviderError):
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
 
+async def test_openai_request_exceeds_config_timeout(openai_no_retry_provider, sample_market_data, monkeypatch):
+    """Test a request outlasting config.timeout is cancelled and raises ProviderTimeoutError"""
+    # Below ProviderConfig's whole-second minimum to keep the test fast
+    monkeypatch.setattr(openai_no_retry_provider.config, "timeout", 0.05)
+    cancelled = False
+
+    async def create(**kwargs):
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    monkeypatch.setattr(
+        openai_no_retry_provider,
+        "client",
+        SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+    )
 
-@pytest.mark.asyncio
-async def test_gemini_api_error_retry(gemini_config, sample_market_data, valid_json_response):
-    """Test Gemini handles API errors gracefully"""
-    with patch('llm_service.providers.gemini_provider.genai') as mock_genai:
-        mock_response = Mock()
-        mock_response.text = json.dumps(valid_json_response)
-
-        mock_model = Mock()
-        # Fail first time, succeed second time
-        mock_model.generate_content = Mock(
-            side_effect=[Exception("API Error"), mock_response]
+    with pytest.raises(ProviderTimeoutError):
+        await openai_no_retry_provider.generate_signal(
+            market_data=sample_market_data,
+            pair="BTC/USDT",
+            timeframe="1h"
         )
 
-        mock_genai.configure = Mock()
-        mock_genai.GenerativeModel = Mock(return_value=mock_model)
+    assert cancelled
 
-        provider = GeminiProvider(gemini_config)
-
-        # First call will fail and raise ProviderError
-        with pytest.raises(ProviderError):
-            await provider.generate_signal(
-                market_data=sample_market_data,
-                pair="BTC/USDT",
-                timeframe="1h"
-            )
 
+async def test_openai_json_parsing_error(openai_provider, sample_market_data):
+    """Test OpenAI handles JSON parsing errors"""
+    openai_provider.client = _FakeOpenAIClient(openai_resp("Not valid JSON!"))
 
-@pytest.mark.asyncio
-async def test_grok_missing_usage_data(grok_config, sample_market_data, valid_json_response):
-    """Test Grok handles missing usage data"""
-    with patch('llm_service.providers.grok_provider.AsyncOpenAI') as mock_openai:
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content=json.dumps(valid_json_response)), finish_reason="stop")]
-        mock_response.usage = None  # No usage data
+    with pytest.raises(ProviderError):
+        await openai_provider.generate_signal(
+            market_data=sample_market_data,
+            pair="BTC/USDT",
+            timeframe="1h"
+        )
 
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        mock_openai.return_value = mock_client
 
-        provider = GrokProvider(grok_config)
-        provider.client = mock_client
+async def test_gemini_api_error_retry(gemini_provider, sample_market_data):
+    """Test Gemini handles API errors gracefully"""
+    # Gemini has no retry loop, so only the first (failing) call is ever made
+    gemini_provider.model = _FakeGeminiModel(Exception("API Error"))
 
-        response = await provider.generate_signal(
+    # First call will fail and raise ProviderError
+    with pytest.raises(ProviderError):
+        await gemini_provider.generate_signal(
             market_data=sample_market_data,
             pair="BTC/USDT",
             timeframe="1h"
         )
 
-        # Should handle None usage gracefully
-        assert response.decision == "BUY"
-        assert response.tokens_used == 0
-        assert response.cost_usd >= 0
+
+async def test_grok_missing_usage_data(grok_provider, sample_market_data, valid_json_text):
+    """Test Grok handles missing usage data"""
+    mock_response = grok_resp(valid_json_text)
+    mock_response.usage = None  # No usage data
+    grok_provider.client = _FakeOpenAIClient(mock_response)
+
+    response = await grok_provider.generate_signal(
+        market_data=sample_market_data,
+        pair="BTC/USDT",
+        timeframe="1h"
+    )
+
+    # Should handle None usage gracefully
+    assert response.decision == "BUY"
+    assert response.tokens_used == 0
+    assert response.cost_usd >= 0
 
 
 def test_provider_config_invalid_max_tokens():
@@ -1369,3 +1224,14 @@ def test_provider_config_invalid_timeout():
             api_key="test_key",
             timeout=0  # Invalid
         )
+
+
+def test_provider_config_invalid_max_concurrency():
+    """Test provider config validates max_concurrency"""
+    with pytest.raises(ValueError):
+        ProviderConfig(
+            name="test",
+            model="test-model",
+            api_key="test_key",
+            max_concurrency=0  # Invalid
+        )
@@ -1,43 +1,47 @@
 """
 Test suite for Risk Management API endpoints
 """
-import pytest
-from django.test import TestCase, Client
-from django.urls import reverse
 import json
 
+import pytest
+from django.test import SimpleTestCase
+from django.urls import reverse
 
-class TestRiskAPIEndpoints(TestCase):
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
+
+# Canonical BTC/USDT long shared by the tests; override fields with {**_BTC_POS, ...}
+_BTC_POS = {
+    "id": "pos_1",
+    "pair": "BTC/USDT",
+    "market_type": "crypto",
+    "entry_price": 40000.0,
+    "current_price": 42000.0,
+    "amount": 0.5,
+    "value_usd": 21000.0,
+    "unrealized_pnl": 1000.0,
+    "leverage": 1.0,
+}
+_PORTFOLIO_50K = 50000.0
+_PORTFOLIO_100K = 100000.0
+
+
+class TestRiskAPIEndpoints(SimpleTestCase):
     """Test suite for Risk Management API endpoints"""
 
-    def setUp(self):
-        """Set up test client"""
-        self.client = Client()
+    def _post(self, url, payload):
+        """POST ``payload`` as JSON bytes, which the client sends as-is"""
+        return self.client.post(url, data=_json_dumps(payload), content_type="application/json")
 
     def test_portfolio_risk_endpoint_success(self):
         """Test portfolio risk endpoint with valid data"""
-        data = {
-            "positions": [
-                {
-                    "id": "pos_1",
-                    "pair": "BTC/USDT",
-                    "market_type": "crypto",
-                    "entry_price": 40000.0,
-                    "current_price": 42000.0,
-                    "amount": 0.5,
-                    "value_usd": 21000.0,
-                    "unrealized_pnl": 1000.0,
-                    "leverage": 1.0,
-                }
-            ],
-            "portfolio_value": 50000.0,
-        }
+        data = {"positions": [_BTC_POS], "portfolio_value": _PORTFOLIO_50K}
 
-        response = self.client.post(
-            "/api/v1/risk/portfolio",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/portfolio", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -53,11 +57,7 @@ class TestRiskAPIEndpoints(TestCase):
             # Missing portfolio_value
         }
 
-        response = self.client.post(
-            "/api/v1/risk/portfolio",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/portfolio", data)
 
         assert response.status_code == 400
         response_data = response.json()
@@ -67,17 +67,7 @@ class TestRiskAPIEndpoints(TestCase):
         """Test portfolio risk with mixed market types"""
         data = {
             "positions": [
-                {
-                    "id": "pos_1",
-                    "pair": "BTC/USDT",
-                    "market_type": "crypto",
-                    "entry_price": 40000.0,
-                    "current_price": 42000.0,
-                    "amount": 0.5,
-                    "value_usd": 21000.0,
-                    "unrealized_pnl": 1000.0,
-                    "leverage": 1.0,
-                },
+                _BTC_POS,
                 {
                     "id": "pos_2",
                     "pair": "ELECTION_2024",
@@ -90,14 +80,10 @@ class TestRiskAPIEndpoints(TestCase):
                     "leverage": 1.0,
                 },
             ],
-            "portfolio_value": 50000.0,
+            "portfolio_value": _PORTFOLIO_50K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/portfolio",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/portfolio", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -107,26 +93,11 @@ class TestRiskAPIEndpoints(TestCase):
     def test_position_risk_endpoint_success(self):
         """Test position risk endpoint with valid data"""
         data = {
-            "position": {
-                "id": "pos_1",
-                "pair": "BTC/USDT",
-                "market_type": "crypto",
-                "entry_price": 40000.0,
-                "current_price": 42000.0,
-                "amount": 0.5,
-                "value_usd": 21000.0,
-                "unrealized_pnl": 1000.0,
-                "leverage": 2.0,
-                "stop_loss": 38000.0,
-            },
-            "portfolio_value": 100000.0,
+            "position": {**_BTC_POS, "leverage": 2.0, "stop_loss": 38000.0},
+            "portfolio_value": _PORTFOLIO_100K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/position",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/position", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -139,25 +110,11 @@ class TestRiskAPIEndpoints(TestCase):
     def test_position_risk_endpoint_oversized(self):
         """Test position risk with oversized position"""
         data = {
-            "position": {
-                "id": "pos_1",
-                "pair": "BTC/USDT",
-                "market_type": "crypto",
-                "entry_price": 40000.0,
-                "current_price": 42000.0,
-                "amount": 5.0,
-                "value_usd": 210000.0,
-                "unrealized_pnl": 10000.0,
-                "leverage": 1.0,
-            },
-            "portfolio_value": 100000.0,
+            "position": {**_BTC_POS, "amount": 5.0, "value_usd": 210000.0, "unrealized_pnl": 10000.0},
+            "portfolio_value": _PORTFOLIO_100K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/position",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/position", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -175,11 +132,7 @@ class TestRiskAPIEndpoints(TestCase):
             },
         }
 
-        response = self.client.post(
-            "/api/v1/risk/evaluate-signal",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/evaluate-signal", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -202,11 +155,7 @@ class TestRiskAPIEndpoints(TestCase):
             },
         }
 
-        response = self.client.post(
-            "/api/v1/risk/evaluate-signal",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/evaluate-signal", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -222,40 +171,20 @@ class TestRiskAPIEndpoints(TestCase):
             },
         }
 
-        response = self.client.post(
-            "/api/v1/risk/evaluate-signal",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/evaluate-signal", data)
 
         assert response.status_code == 400
 
     def test_check_limits_endpoint_approved(self):
         """Test position limit check endpoint - approved"""
         data = {
-            "positions": [
-                {
-                    "id": "pos_1",
-                    "pair": "BTC/USDT",
-                    "market_type": "crypto",
-                    "entry_price": 40000.0,
-                    "current_price": 42000.0,
-                    "amount": 0.5,
-                    "value_usd": 21000.0,
-                    "unrealized_pnl": 1000.0,
-                    "leverage": 1.0,
-                }
-            ],
+            "positions": [_BTC_POS],
             "new_position_value": 5000.0,
             "new_position_type": "crypto",
-            "portfolio_value": 100000.0,
+            "portfolio_value": _PORTFOLIO_100K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/check-limits",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/check-limits", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -268,14 +197,10 @@ class TestRiskAPIEndpoints(TestCase):
             "positions": [],
             "new_position_value": 20000.0,  # 20% of portfolio
             "new_position_type": "crypto",
-            "portfolio_value": 100000.0,
+            "portfolio_value": _PORTFOLIO_100K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/check-limits",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/check-limits", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -303,14 +228,10 @@ class TestRiskAPIEndpoints(TestCase):
             "positions": positions,
             "new_position_value": 1000.0,
             "new_position_type": "crypto",
-            "portfolio_value": 100000.0,
+            "portfolio_value": _PORTFOLIO_100K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/check-limits",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/check-limits", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -327,11 +248,7 @@ class TestRiskAPIEndpoints(TestCase):
             "risk_per_trade": 0.02,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/calculate-stop-loss",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/calculate-stop-loss", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -351,11 +268,7 @@ class TestRiskAPIEndpoints(TestCase):
             "risk_per_trade": 0.02,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/calculate-stop-loss",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/calculate-stop-loss", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -372,11 +285,7 @@ class TestRiskAPIEndpoints(TestCase):
             "risk_per_trade": 0.02,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/calculate-stop-loss",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/calculate-stop-loss", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -392,11 +301,7 @@ class TestRiskAPIEndpoints(TestCase):
             "market_type": "crypto",
         }
 
-        response = self.client.post(
-            "/api/v1/risk/calculate-stop-loss",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/calculate-stop-loss", data)
 
         assert response.status_code == 400
 
@@ -412,11 +317,7 @@ class TestRiskAPIEndpoints(TestCase):
 
         for endpoint in endpoints:
             # Test that endpoint exists (even if it returns error without data)
-            response = self.client.post(
-                endpoint,
-                data=json.dumps({}),
-                content_type="application/json",
-            )
+            response = self._post(endpoint, {})
             # Should not be 404
             assert response.status_code != 404
 
@@ -424,14 +325,10 @@ class TestRiskAPIEndpoints(TestCase):
         """Test portfolio risk with empty positions list"""
         data = {
             "positions": [],
-            "portfolio_value": 50000.0,
+            "portfolio_value": _PORTFOLIO_50K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/portfolio",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/portfolio", data)
 
         assert response.status_code == 200
         response_data = response.json()
@@ -441,25 +338,11 @@ class TestRiskAPIEndpoints(TestCase):
     def test_high_leverage_position_risk(self):
         """Test position risk with high leverage"""
         data = {
-            "position": {
-                "id": "pos_1",
-                "pair": "BTC/USDT",
-                "market_type": "crypto",
-                "entry_price": 40000.0,
-                "current_price": 42000.0,
-                "amount": 0.5,
-                "value_usd": 21000.0,
-                "unrealized_pnl": 1000.0,
-                "leverage": 10.0,  # Very high leverage
-            },
-            "portfolio_value": 100000.0,
+            "position": {**_BTC_POS, "leverage": 10.0},  # Very high leverage
+            "portfolio_value": _PORTFOLIO_100K,
         }
 
-        response = self.client.post(
-            "/api/v1/risk/position",
-            data=json.dumps(data),
-            content_type="application/json",
-        )
+        response = self._post("/api/v1/risk/position", data)
 
         assert response.status_code == 200
         response_data = response.json()